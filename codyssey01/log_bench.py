@@ -0,0 +1,207 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+
+from log_generator import START, generate_log, parse_count
+
+MODES = ['analyze', 'glob', 'reverse', 'search', 'index', 'range', 'convert', 'counts']
+RESULTS_PATH = 'codyssey01/bench_results.jsonl'
+SEARCH_TEXT = 'Oxygen tank explosion'
+LINES_PER_SECOND = 10  # log_generator 기본값과 같아야 구간 조회 시각을 계산할 수 있음
+RESULT_MODES = ('search', 'range')  # 결과 줄만 돌려주는 모드: 처리량을 전체 줄 수가 아니라 결과 줄 수로 계산
+
+
+class FirstResult:
+    # 첫 결과가 나온 시점을 기록하는 래퍼 (time-to-first-report 측정용)
+
+    def __init__(self, started):
+        self.started = started
+        self.seconds = None
+
+    def wrap(self, iterable):
+        for item in iterable:
+            if self.seconds is None:
+                self.seconds = time.perf_counter() - self.started
+            yield item
+
+
+def generate_shards(work_dir, size, lines, seed, incident_rate, shards):
+    # glob 모드용: 같은 전체 줄 수를 shards개 파일로 나눠 생성 (i번째 파일은 seed + i)
+    shard_dir = os.path.join(work_dir, f'shards_{size}_seed{seed}_rate{incident_rate}_x{shards}')
+    os.makedirs(shard_dir, exist_ok=True)
+    paths = []
+    for i in range(shards):
+        path = os.path.join(shard_dir, f'part{i:03d}.log')
+        if not os.path.exists(path):
+            print(f'로그 생성: {path}')
+            generate_log(path, lines // shards + (1 if i < lines % shards else 0),
+                         seed + i, incident_rate, LINES_PER_SECOND)
+        paths.append(path)
+    return paths
+
+
+def run_mode(mode, log_path, lines, work_dir, shard_paths=None):
+    # 모드 하나를 실행하고 (처리 시간, 첫 결과까지 걸린 시간, 결과 수)를 돌려줌
+    # 모듈은 측정하는 자식 프로세스 안에서만 불러옴
+    from log_columnar import ColumnarLog, convert_log
+    from log_correlate import ContextWindow
+    from log_index import index_path_for, query_range, update_index
+    from log_parallel import analyze_files
+    from log_reader import iter_lines, iter_lines_reverse, parse_timestamp
+    from log_rules import RULES_PATH, RuleMatcher, load_rules
+    from log_search import search_log
+    from log_template import TemplateMiner
+    from main import build_pipeline, write_reports
+
+    col_path = os.path.join(work_dir, os.path.basename(log_path or '') + '.col')
+    if mode == 'counts' and not os.path.exists(col_path):
+        convert_log(log_path, col_path)  # 집계만 재기 위해 변환은 측정 전에 끝냄
+    if mode == 'index' and os.path.exists(index_path_for(log_path)):
+        os.remove(index_path_for(log_path))  # 인덱스를 처음부터 만드는 시간을 잼
+    if mode == 'range':
+        update_index(log_path)
+
+    started = time.perf_counter()
+    first = FirstResult(started)
+    results = 0
+    if mode == 'analyze':
+        matcher = RuleMatcher(load_rules(RULES_PATH))
+        hits, miner, window = build_pipeline(iter_lines(log_path), matcher)
+        results = write_reports(
+            first.wrap(hits), matcher,
+            os.path.join(work_dir, 'problem.txt'), os.path.join(work_dir, 'log_analysis.md'),
+            miner, window
+        )
+    elif mode == 'glob':
+        # --glob과 같은 경로: 프로세스 풀에서 파일별로 분석하고 k-way 병합으로 보고서 작성
+        matcher = RuleMatcher(load_rules(RULES_PATH))
+        miner = TemplateMiner()
+        window = ContextWindow(5 * 60)
+        results = analyze_files(
+            shard_paths, RULES_PATH,
+            lambda hits: write_reports(
+                first.wrap(hits), matcher,
+                os.path.join(work_dir, 'problem.txt'), os.path.join(work_dir, 'log_analysis.md'),
+                miner, window
+            ),
+            miner=miner, window=window
+        )
+    elif mode == 'reverse':
+        for _ in first.wrap(iter_lines_reverse(log_path)):
+            results += 1
+    elif mode == 'search':
+        for _ in first.wrap(search_log(log_path, SEARCH_TEXT)):
+            results += 1
+    elif mode == 'index':
+        results = len(update_index(log_path)['keys'])
+    elif mode == 'range':
+        # 로그 가운데 10분 구간 조회 (로그 시각은 UTC 기준 epoch로 계산해서 서머타임 영향을 받지 않음)
+        middle = parse_timestamp(START) + lines // LINES_PER_SECOND // 2
+        start = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(middle))
+        end = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(middle + 600))
+        for _ in first.wrap(query_range(log_path, start, end)):
+            results += 1
+    elif mode == 'convert':
+        results = convert_log(log_path, col_path)
+    elif mode == 'counts':
+        with ColumnarLog(col_path) as log:
+            results = sum(log.count_by_event().values())
+    else:
+        raise ValueError(f'알 수 없는 모드: {mode}')
+    seconds = time.perf_counter() - started
+    return seconds, first.seconds if first.seconds is not None else seconds, results
+
+
+def measure(mode, log_path, lines, work_dir, queue, shard_paths=None):
+    # 자식 프로세스에서 실행되어 최대 메모리(RSS)가 다른 모드와 섞이지 않도록 함
+    try:
+        seconds, first_seconds, results = run_mode(mode, log_path, lines, work_dir, shard_paths)
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # 리눅스는 KB 단위
+        result = {'seconds': seconds, 'first_report_s': first_seconds,
+                  'results': results, 'peak_rss_mb': round(peak_kb / 1024, 1)}
+        if mode == 'glob':  # 작업 프로세스 중 가장 큰 RSS (부모 RSS와 따로 기록)
+            worker_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            result['worker_peak_rss_mb'] = round(worker_kb / 1024, 1)
+        queue.put(result)
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def run_benchmark(sizes, modes, seed, incident_rate, work_dir, results_path, shards=4):
+    os.makedirs(work_dir, exist_ok=True)
+    context = multiprocessing.get_context('spawn')  # fork하면 부모의 메모리 사용량이 섞임
+    records = []
+    for size in sizes:
+        lines = parse_count(size)
+        log_path = None
+        if any(mode != 'glob' for mode in modes):
+            log_path = os.path.join(work_dir, f'bench_{size}_seed{seed}_rate{incident_rate}.log')
+            if not os.path.exists(log_path):
+                print(f'로그 생성: {log_path}')
+                generate_log(log_path, lines, seed, incident_rate, LINES_PER_SECOND)
+        shard_paths = None
+        if 'glob' in modes:
+            shard_paths = generate_shards(work_dir, size, lines, seed, incident_rate, shards)
+        for mode in modes:
+            paths = shard_paths if mode == 'glob' else [log_path]
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(mode, log_path, lines, work_dir, queue, shard_paths))
+            process.start()
+            result = queue.get()
+            process.join()
+            record = {
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'mode': mode,
+                'lines': lines,
+                'files': len(paths),
+                'bytes': sum(os.path.getsize(path) for path in paths),
+                'seed': seed,
+                'incident_rate': incident_rate,
+            }
+            record.update(result)
+            if 'seconds' in result:
+                processed = result['results'] if mode in RESULT_MODES else lines
+                record['lines_per_s'] = round(processed / result['seconds']) if result['seconds'] else None
+            records.append(record)
+            print_record(record)
+            with open(results_path, 'a', encoding='UTF-8') as f:  # 실행마다 누적해서 추이를 볼 수 있게 함
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return records
+
+
+def print_record(record):
+    if 'error' in record:
+        print(f'{record["mode"]:<8} {record["lines"]:>11,}줄  오류: {record["error"]}')
+        return
+    unit = 'result lines/s' if record['mode'] in RESULT_MODES else 'lines/s'
+    print(
+        f'{record["mode"]:<8} {record["lines"]:>11,}줄  '
+        f'{record["seconds"]:8.2f}s  {record["lines_per_s"]:>12,} {unit:<14}  '
+        f'RSS {record["peak_rss_mb"]:8.1f}MB  첫 결과 {record["first_report_s"]:.3f}s'
+        + (f'  파일 {record["files"]}개' if record['files'] > 1 else '')
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그 분석기 모드별 벤치마크')
+    parser.add_argument('--sizes', default='1M', help='쉼표로 구분한 로그 크기 (예: 1M,10M,100M)')
+    parser.add_argument('--modes', default=','.join(MODES), help='측정할 모드: ' + ', '.join(MODES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--incident-rate', type=float, default=0.001)
+    parser.add_argument('--shards', type=int, default=4, help='glob 모드에서 전체 줄 수를 나눠 담을 로그 파일 수')
+    parser.add_argument('--work-dir', default='codyssey01/bench')
+    parser.add_argument('--results', default=RESULTS_PATH, help='결과를 JSON Lines로 누적 저장할 파일')
+    args = parser.parse_args()
+
+    run_benchmark(
+        [size.strip() for size in args.sizes.split(',') if size.strip()],
+        [mode.strip() for mode in args.modes.split(',') if mode.strip()],
+        args.seed, args.incident_rate, args.work_dir, args.results, args.shards
+    )
+
+
+if __name__ == '__main__':
+    main()
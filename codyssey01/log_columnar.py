@@ -0,0 +1,195 @@
+import bisect
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+
+from log_reader import iter_lines, parse_timestamp
+
+MAGIC = b'MLOGCOL1'
+# magic, 줄 수, 이벤트 코드 크기(1 또는 2바이트), 시간순 여부,
+# 섹션 위치: 타임스탬프, 이벤트 코드, 메시지 번호, 이벤트 사전, 메시지 테이블
+HEADER = struct.Struct('<8sQBB6xQQQQQ')
+CHUNK = 64 * 1024  # 임시 파일로 내보내기 전에 모아두는 값 개수
+
+
+def columnar_path_for(log_path):
+    return log_path + '.col'
+
+
+def pad8(f):
+    # 각 섹션이 8바이트 경계에서 시작하도록 채움 (memoryview.cast에 맞추기 위해)
+    f.write(b'\0' * (-f.tell() % 8))
+
+
+def write_string_table(f, strings):
+    # 문자열 개수, 오프셋 (개수+1개, uint64), 문자열 바이트를 이어서 기록
+    encoded = [text.encode('UTF-8') for text in strings]
+    offsets = array('Q', [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    f.write(struct.pack('<Q', len(encoded)))
+    offsets.tofile(f)
+    for item in encoded:
+        f.write(item)
+
+
+def read_string_table(buffer, position):
+    count = struct.unpack_from('<Q', buffer, position)[0]
+    position += 8
+    offsets = array('Q')
+    offsets.frombytes(buffer[position:position + 8 * (count + 1)])
+    base = position + 8 * (count + 1)
+    return [bytes(buffer[base + offsets[i]:base + offsets[i + 1]]).decode('UTF-8') for i in range(count)]
+
+
+def convert_log(log_path, out_path=None):
+    # 로그를 한 번 순회하면서 열별 임시 파일에 나눠 쓰고, 마지막에 한 파일로 합침
+    # 메모리에는 이벤트/메시지 사전과 CHUNK 크기의 버퍼만 유지
+    out_path = out_path or columnar_path_for(log_path)
+    events = {}  # 이벤트 등급 -> 코드
+    messages = {}  # 메시지 -> 번호 (같은 메시지는 한 번만 저장)
+    count = 0
+    in_order = True
+    last_ts = None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [os.path.join(temp_dir, name) for name in ('ts', 'event', 'message')]
+        ts_file, event_file, message_file = (open(path, 'wb') for path in paths)
+        ts_buf, event_buf, message_buf = array('q'), array('H'), array('I')
+        try:
+            for line in iter_lines(log_path):
+                parts = line.split(',', 2)
+                if len(parts) < 3:
+                    continue
+                try:
+                    ts = parse_timestamp(parts[0])
+                except ValueError:
+                    continue
+                if last_ts is not None and ts < last_ts:
+                    in_order = False
+                last_ts = ts
+                ts_buf.append(ts)
+                event_buf.append(events.setdefault(parts[1], len(events)))
+                message_buf.append(messages.setdefault(parts[2], len(messages)))
+                count += 1
+                if len(ts_buf) >= CHUNK:
+                    for buf, f in ((ts_buf, ts_file), (event_buf, event_file), (message_buf, message_file)):
+                        buf.tofile(f)
+                        del buf[:]
+            for buf, f in ((ts_buf, ts_file), (event_buf, event_file), (message_buf, message_file)):
+                buf.tofile(f)
+        finally:
+            for f in (ts_file, event_file, message_file):
+                f.close()
+
+        # 이벤트 종류가 256개 이하면 코드를 1바이트로 줄여서 저장
+        event_width = 1 if len(events) <= 256 else 2
+
+        temp_out = out_path + '.tmp'
+        with open(temp_out, 'wb') as out:
+            out.write(b'\0' * HEADER.size)
+            pad8(out)
+            sections = []
+            for path, width in ((paths[0], 8), (paths[1], event_width), (paths[2], 4)):
+                sections.append(out.tell())
+                with open(path, 'rb') as f:
+                    if width == 1:
+                        codes = array('H')
+                        while True:
+                            block = f.read(CHUNK * 2)
+                            if not block:
+                                break
+                            codes.frombytes(block)
+                            array('B', codes).tofile(out)  # 코드가 256 미만이므로 1바이트로 변환
+                            del codes[:]
+                    else:
+                        shutil.copyfileobj(f, out)
+                pad8(out)
+            sections.append(out.tell())
+            write_string_table(out, sorted(events, key=events.get))
+            pad8(out)
+            sections.append(out.tell())
+            write_string_table(out, sorted(messages, key=messages.get))
+
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, count, event_width, int(in_order), *sections))
+        os.replace(temp_out, out_path)
+    return count
+
+
+class ColumnarLog:
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.count, self.event_width, in_order,
+         ts_pos, event_pos, message_pos, event_dict_pos, message_table_pos) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f'열 형식 로그 파일이 아님: {filename}')
+        self.in_order = bool(in_order)
+        view = memoryview(self.mm)
+        # 텍스트를 다시 나누지 않고 매핑된 메모리를 바로 배열처럼 사용
+        self.timestamps = view[ts_pos:ts_pos + 8 * self.count].cast('q')
+        self.event_codes = view[event_pos:event_pos + self.event_width * self.count]
+        if self.event_width == 2:
+            self.event_codes = self.event_codes.cast('H')
+        self.message_ids = view[message_pos:message_pos + 4 * self.count].cast('I')
+        self.events = read_string_table(self.mm, event_dict_pos)
+        self.message_table_pos = message_table_pos
+        self.messages = None  # 메시지 테이블은 실제로 필요할 때만 읽음
+
+    def close(self):
+        # memoryview를 먼저 해제해야 mmap을 닫을 수 있음
+        for view in (self.timestamps, self.event_codes, self.message_ids):
+            view.release()
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def select_rows(self, start=None, end=None):
+        # start <= 시각 <= end 인 행 번호들을 돌려줌
+        # 시간순으로 저장된 파일이면 이진 탐색으로 연속 구간(range)을 바로 찾음
+        start_ts = parse_timestamp(start) if start else None
+        end_ts = parse_timestamp(end) if end else None
+        if self.in_order:
+            first = 0 if start_ts is None else bisect.bisect_left(self.timestamps, start_ts)
+            last = self.count if end_ts is None else bisect.bisect_right(self.timestamps, end_ts)
+            return range(first, max(first, last))
+        return [
+            row for row, ts in enumerate(self.timestamps)
+            if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts)
+        ]
+
+    def count_by_event(self, rows=None):
+        rows = range(self.count) if rows is None else rows
+        if isinstance(rows, range) and self.event_width == 1:
+            # 연속 구간의 1바이트 코드는 bytes.count로 C 속도로 셈
+            data = self.event_codes[rows.start:rows.stop].tobytes()
+            counts = {name: data.count(bytes([code])) for code, name in enumerate(self.events)}
+        else:
+            counts = dict.fromkeys(self.events, 0)
+            codes = self.event_codes
+            for row in rows:
+                counts[self.events[codes[row]]] += 1
+        return {name: count for name, count in counts.items() if count}
+
+    def message(self, row):
+        if self.messages is None:
+            self.messages = read_string_table(self.mm, self.message_table_pos)
+        return self.messages[self.message_ids[row]]
+
+    def rows(self, rows=None):
+        rows = range(self.count) if rows is None else rows
+        for row in rows:
+            yield self.timestamps[row], self.events[self.event_codes[row]], self.message(row)
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from collections import deque
+from itertools import islice
+
+from log_reader import parse_timestamp
+
+
+class ContextWindow:
+    # 최근 N초 동안의 로그만 덱(deque)에 유지하면서, 사고가 발생하면 그 직전 로그를 함께 기록
+    # 각 줄은 한 번 넣고 한 번 빠지므로 전체 비용은 O(n), 사고마다 다시 검색하지 않음
+    # 사고별 직전 로그는 임시 파일에 JSON 한 줄씩 쌓고 메모리에는 위치만 남김 (사고가 많아도 메모리가 거의 늘지 않음)
+
+    def __init__(self, seconds, max_lines=50):
+        self.seconds = seconds
+        self.max_lines = max_lines  # 사고 하나에 저장하는 직전 로그 최대 줄 수 (가장 최근 것부터)
+        self.recent = deque()  # (epoch, 줄)
+        self.offsets = {}  # 사고 로그 -> 스풀 파일에서 직전 로그가 기록된 위치
+        self.spool = None  # 직전 로그를 기록하는 임시 파일 (처음 기록할 때 만듦)
+        self.last_stamp = None
+        self.last_ts = None
+
+    def push(self, line):
+        stamp = line[:19]
+        if stamp != self.last_stamp:  # 같은 시각이 이어지면 다시 변환하지 않음
+            try:
+                self.last_ts = parse_timestamp(stamp)
+            except ValueError:
+                return
+            self.last_stamp = stamp
+        ts = self.last_ts
+        self.recent.append((ts, line))
+        while self.recent and self.recent[0][0] < ts - self.seconds:
+            self.recent.popleft()
+
+    def feed(self, lines):
+        for line in lines:
+            self.push(line)
+            yield line
+
+    def snapshot(self, line):
+        # 지금 창에서 자기 자신을 뺀 직전 로그, 창 전체를 복사하지 않고 끝에서부터 max_lines 줄만 가져옴
+        context = [
+            recent for _, recent in islice(reversed(self.recent), self.max_lines + 1)
+            if recent is not line
+        ]
+        context.reverse()
+        return context[-self.max_lines:]
+
+    def capture(self, hits):
+        # feed()를 거친 줄에서 나온 hits에 그 순간의 직전 로그를 붙여서 (줄, 규칙, 직전 로그)로 넘김
+        for line, names in hits:
+            yield line, names, self.snapshot(line)
+
+    def keep(self, hits):
+        # capture()의 결과에서 직전 로그는 스풀에 기록하고 (줄, 규칙)만 넘김
+        for line, names, context in hits:
+            self.store(line, context)
+            yield line, names
+
+    def store(self, line, context):
+        self.store_json(line, json.dumps(context, ensure_ascii=False))
+
+    def store_json(self, line, text):
+        # 같은 사고 로그가 여러 번 나오면 처음 기록한 직전 로그만 사용
+        if line in self.offsets:
+            return
+        if self.spool is None:
+            self.spool = tempfile.TemporaryFile()
+        self.spool.seek(0, os.SEEK_END)
+        self.offsets[line] = self.spool.tell()
+        self.spool.write(text.encode('UTF-8') + b'\n')
+
+    def context(self, line):
+        offset = self.offsets.get(line)
+        if offset is None:
+            return []
+        self.spool.seek(offset)
+        return json.loads(self.spool.readline())
+
+    def close(self):
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        self.offsets.clear()
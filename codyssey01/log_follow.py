@@ -0,0 +1,75 @@
+import os
+import time
+
+from log_reader import check_plain
+
+CHECKPOINT_PATH = 'codyssey01/follow_checkpoint.txt'
+
+
+def load_checkpoint(checkpoint_path):
+    # setting.txt와 같은 key=value 형식 (inode, offset)
+    checkpoint = {'inode': None, 'offset': 0}
+    if not os.path.exists(checkpoint_path):
+        return checkpoint
+    with open(checkpoint_path, 'r') as f:
+        for line in f:
+            parts = line.strip().split('=')
+            if len(parts) == 2 and parts[0] in checkpoint:
+                checkpoint[parts[0]] = int(parts[1])
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path, inode, offset):
+    temp_path = checkpoint_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(f'inode={inode}\n')
+        f.write(f'offset={offset}\n')
+    os.replace(temp_path, checkpoint_path)  # 저장 도중 종료되어도 이전 체크포인트는 유지
+
+
+def follow_once(log_path, matcher, report, checkpoint_path=CHECKPOINT_PATH):
+    # 체크포인트 이후에 추가된 줄만 읽어서 문제 로그를 report(hits)로 넘김
+    checkpoint = load_checkpoint(checkpoint_path)
+    stat = os.stat(log_path)
+    offset = checkpoint['offset']
+    # 로그가 교체(로테이션)되었거나 잘려서 작아졌으면 새 파일의 처음부터 읽음
+    if checkpoint['inode'] != stat.st_ino or stat.st_size < offset:
+        offset = 0
+    if stat.st_size == offset:
+        return 0
+
+    hits = []
+    with open(log_path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break  # 아직 쓰는 중인 마지막 줄은 다음 번에 처리
+            offset += len(raw)
+            line = raw.rstrip(b'\r\n').decode('UTF-8')
+            if not line or line.startswith('timestamp,'):
+                continue  # 빈 줄과 헤더는 건너뜀
+            names = matcher.match(line)
+            if names:
+                hits.append((line, names))
+
+    if hits:
+        report(hits)
+    # 보고서를 먼저 쓰고 체크포인트를 저장하므로 중간에 죽어도 로그를 놓치지 않음
+    save_checkpoint(checkpoint_path, stat.st_ino, offset)
+    return len(hits)
+
+
+def follow_log(log_path, matcher, report, checkpoint_path=CHECKPOINT_PATH, interval=1.0):
+    # 로그 파일이 늘어나는 것을 계속 지켜보면서 새 줄만 분석 (Ctrl+C로 종료)
+    check_plain(log_path, 'follow 모드')
+    try:
+        while True:
+            try:
+                count = follow_once(log_path, matcher, report, checkpoint_path)
+                if count:
+                    print(f'새 문제 로그 {count}건')
+            except FileNotFoundError:
+                pass  # 로테이션 직후 새 파일이 아직 없을 수 있음
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('Follow stopped...')
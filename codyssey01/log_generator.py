@@ -0,0 +1,79 @@
+import argparse
+import calendar
+import gzip
+import random
+import time
+
+# 정상 상태 메시지 (숫자 자리는 실행할 때마다 다르게 채움)
+NORMAL_MESSAGES = [
+    ('INFO', 'Power systems online. Batteries at {n}% charge.'),
+    ('INFO', 'Life support systems nominal.'),
+    ('INFO', 'Navigation systems show nominal performance.'),
+    ('INFO', 'Telemetry packet {n} received from mission control.'),
+    ('INFO', 'Cabin pressure stable at {n} kPa.'),
+    ('INFO', 'Heat shield temperature {n} C within limits.'),
+    ('INFO', 'Rover {n} reported position update.'),
+    ('INFO', 'Dust storm index at {n}.'),
+]
+
+# 사고 메시지 (incident_rate 비율로 섞음)
+INCIDENT_MESSAGES = [
+    ('INFO', 'Oxygen tank unstable.'),
+    ('WARNING', 'Oxygen tank pressure dropped to {n} kPa.'),
+    ('ERROR', 'Oxygen tank explosion.'),
+    ('CRITICAL', 'Life support failure in module {n}.'),
+]
+
+START = '2023-08-27 10:00:00'
+
+
+def parse_count(text):
+    # '1M', '10M', '500k' 같은 표기를 줄 수로 변환
+    text = text.strip().upper()
+    units = {'K': 1000, 'M': 1000 * 1000, 'G': 1000 * 1000 * 1000}
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def generate_log(filename, lines, seed=0, incident_rate=0.001, lines_per_second=10, start=START):
+    # 같은 seed와 설정이면 항상 같은 로그를 만듦 (.gz로 끝나면 gzip으로 압축해서 저장)
+    rng = random.Random(seed)
+    ts = calendar.timegm(time.strptime(start, '%Y-%m-%d %H:%M:%S'))
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'wt', encoding='UTF-8') as f:
+        f.write('timestamp,event,message\n')
+        buffer = []
+        stamp = None
+        for i in range(lines):
+            if i % lines_per_second == 0:  # 같은 초 안의 줄은 시각 문자열을 다시 만들지 않음
+                stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts + i // lines_per_second))
+            if rng.random() < incident_rate:
+                event, message = rng.choice(INCIDENT_MESSAGES)
+            else:
+                event, message = rng.choice(NORMAL_MESSAGES)
+            if '{n}' in message:
+                message = message.replace('{n}', str(rng.randint(0, 999)))
+            buffer.append(f'{stamp},{event},{message}\n')
+            if len(buffer) >= 10000:
+                f.writelines(buffer)
+                buffer.clear()
+        f.writelines(buffer)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 합성 미션 로그 생성기')
+    parser.add_argument('--lines', default='1M', help='생성할 줄 수 (예: 1M, 10M, 100M)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--incident-rate', type=float, default=0.001, help='사고 로그 비율 (0~1)')
+    parser.add_argument('--out', default='codyssey01/synthetic_mission_computer_main.log')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = generate_log(args.out, parse_count(args.lines), args.seed, args.incident_rate)
+    print(f'{args.out}: {count}줄 생성 ({time.perf_counter() - started:.1f}초)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import bisect
+import os
+
+from log_reader import check_plain, parse_timestamp
+
+BUCKET_SECONDS = 60  # 1분 단위로 오프셋을 기록
+
+
+def index_path_for(log_path):
+    return log_path + '.idx'
+
+
+def load_index(index_path):
+    # 인덱스 파일 형식
+    #   첫 줄: bucket=<초>,inode=<아이노드>,indexed=<인덱싱이 끝난 바이트 위치>
+    #   나머지: <버킷 시작 epoch>,<그 버킷의 첫 줄 바이트 오프셋>
+    index = {'bucket': BUCKET_SECONDS, 'inode': None, 'indexed': 0, 'keys': [], 'offsets': []}
+    if not os.path.exists(index_path):
+        return index
+    with open(index_path, 'r') as f:
+        meta = f.readline().strip().split(',')
+        for item in meta:
+            key, value = item.split('=')
+            index[key] = int(value)
+        for line in f:
+            key, offset = line.strip().split(',')
+            index['keys'].append(int(key))
+            index['offsets'].append(int(offset))
+    return index
+
+
+def save_index(index, index_path):
+    temp_path = index_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(f'bucket={index["bucket"]},inode={index["inode"]},indexed={index["indexed"]}\n')
+        for key, offset in zip(index['keys'], index['offsets']):
+            f.write(f'{key},{offset}\n')
+    os.replace(temp_path, index_path)  # 중간에 멈춰도 기존 인덱스가 깨지지 않도록 교체
+
+
+def update_index(log_path, index_path=None, bucket_seconds=BUCKET_SECONDS):
+    # 처음 실행하면 전체를 인덱싱하고, 이후에는 새로 추가된 부분만 읽어서 인덱스를 갱신
+    check_plain(log_path, '인덱스')
+    index_path = index_path or index_path_for(log_path)
+    index = load_index(index_path)
+    stat = os.stat(log_path)
+
+    # 파일이 교체되었거나(inode 변경) 줄어들었거나 버킷 크기가 바뀌면 처음부터 다시 생성
+    if (index['inode'] != stat.st_ino or stat.st_size < index['indexed']
+            or index['bucket'] != bucket_seconds):
+        index = {'bucket': bucket_seconds, 'inode': stat.st_ino, 'indexed': 0, 'keys': [], 'offsets': []}
+
+    if index['indexed'] == stat.st_size:
+        return index
+
+    with open(log_path, 'rb') as f:
+        if index['indexed'] == 0:
+            f.readline()  # 헤더는 인덱싱하지 않음
+        else:
+            f.seek(index['indexed'])
+        offset = f.tell()
+        last_key = index['keys'][-1] if index['keys'] else None
+        last_stamp = None
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # 아직 다 쓰이지 않은 마지막 줄은 다음 갱신 때 처리
+            stamp = line[:19]
+            if stamp != last_stamp:  # 같은 시각이 이어지면 다시 변환하지 않음
+                last_stamp = stamp
+                try:
+                    key = parse_timestamp(stamp) // bucket_seconds * bucket_seconds
+                except ValueError:
+                    key = None
+                # 시간이 앞으로 진행하는 경우에만 새 버킷으로 기록 (키가 항상 정렬된 상태 유지)
+                if key is not None and (last_key is None or key > last_key):
+                    index['keys'].append(key)
+                    index['offsets'].append(offset)
+                    last_key = key
+            offset += len(line)
+        index['indexed'] = offset
+
+    save_index(index, index_path)
+    return index
+
+
+def query_range(log_path, start, end, index_path=None):
+    # start <= 시각 <= end 인 로그만 돌려줌, 인덱스로 시작 위치를 찾아 바로 이동
+    index = update_index(log_path, index_path)
+    start_ts = parse_timestamp(start)
+    end_ts = parse_timestamp(end)
+
+    position = bisect.bisect_right(index['keys'], start_ts) - 1
+    if position < 0:
+        if not index['offsets']:
+            return
+        position = 0
+
+    with open(log_path, 'rb') as f:
+        f.seek(index['offsets'][position])
+        for line in f:
+            try:
+                ts = parse_timestamp(line[:19])
+            except ValueError:
+                continue
+            if ts > end_ts:
+                break  # 로그는 시간 순서이므로 이후는 볼 필요 없음
+            if ts >= start_ts:
+                yield line.rstrip(b'\r\n').decode('UTF-8')
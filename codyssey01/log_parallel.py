@@ -0,0 +1,102 @@
+import glob
+import heapq
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from log_correlate import ContextWindow
+from log_reader import iter_lines
+from log_rules import RuleMatcher, load_rules, scan_problems
+from log_template import TemplateMiner
+
+SIDECAR_EXTENSIONS = ('.idx', '.col', '.tmp')  # 분석 도구가 로그 옆에 만드는 파일
+
+
+def find_log_files(pattern):
+    # glob 패턴에 맞는 로그 파일 목록 (실행할 때마다 순서가 같도록 정렬)
+    # .gz/.bz2/.xz 압축 로그도 그대로 포함되고 작업 프로세스에서 스트리밍으로 풀어서 읽음
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and not path.endswith(SIDECAR_EXTENSIONS)
+    )
+
+
+def scan_file(log_path, rules_path, spool_dir, mine_templates=False, context_seconds=0):
+    # 작업 프로세스에서 실행: 파일 하나를 훑어서 문제 로그만 임시 파일에 기록
+    # 결과를 리스트로 돌려주지 않고 파일로 넘겨서 부모 프로세스 메모리가 늘지 않도록 함
+    # 템플릿은 개수가 적으므로 목록으로 돌려주고 부모에서 합침
+    # context_seconds를 주면 사고마다 같은 파일의 직전 로그를 JSON 목록으로 함께 기록
+    matcher = RuleMatcher(load_rules(rules_path))
+    miner = TemplateMiner() if mine_templates else None
+    window = ContextWindow(context_seconds) if context_seconds > 0 else None
+    lines = iter_lines(log_path)
+    if miner is not None:
+        lines = miner.feed(lines)
+    if window is not None:
+        lines = window.feed(lines)
+    hits = scan_problems(lines, matcher)
+    if window is not None:
+        hits = window.capture(hits)
+    fd, spool_path = tempfile.mkstemp(dir=spool_dir, suffix='.hits')
+    count = 0
+    in_order = True
+    last_stamp = ''
+    with os.fdopen(fd, 'w', encoding='UTF-8') as spool:
+        for hit in hits:
+            line, names = hit[0], hit[1]
+            stamp = line[:19]
+            if stamp < last_stamp:
+                in_order = False
+            last_stamp = stamp
+            record = '|'.join(names) + '\t' + line
+            if window is not None:  # JSON은 탭/줄바꿈을 이스케이프하므로 마지막 탭 뒤가 항상 직전 로그
+                record += '\t' + json.dumps(hit[2], ensure_ascii=False)
+            spool.write(record + '\n')
+            count += 1
+
+    if not in_order:  # 시간 순서가 아닌 파일은 문제 로그만 다시 정렬 (전체 로그가 아니라 사고 건수만큼)
+        with open(spool_path, 'r', encoding='UTF-8') as spool:
+            records = spool.readlines()
+        records.sort(key=lambda record: record.split('\t', 1)[1][:19])
+        with open(spool_path, 'w', encoding='UTF-8') as spool:
+            spool.writelines(records)
+    return spool_path, count, miner.templates if miner is not None else []
+
+
+def read_spool(spool_path, window=None):
+    # window(ContextWindow)를 주면 기록된 직전 로그를 window의 스풀로 옮김 (JSON 그대로)
+    with open(spool_path, 'r', encoding='UTF-8') as spool:
+        for record in spool:
+            names, line = record.rstrip('\n').split('\t', 1)
+            if window is not None:
+                line, context = line.rsplit('\t', 1)
+                window.store_json(line, context)
+            yield line, names.split('|')
+
+
+def merge_problems(spool_paths, window=None):
+    # 파일별로 이미 시간순인 결과를 k-way 병합 (전체를 모아서 sort()하지 않음)
+    streams = [read_spool(path, window) for path in spool_paths]
+    return heapq.merge(*streams, key=lambda hit: hit[0][:19])
+
+
+def analyze_files(log_paths, rules_path, report, workers=None, miner=None, window=None):
+    # report(hits)에 시간순으로 병합된 문제 로그를 넘겨서 보고서를 작성
+    # miner를 주면 파일별 템플릿을 합쳐서 보고서를 쓰기 전에 채워 둠
+    # window(ContextWindow)를 주면 작업 프로세스가 기록한 직전 로그를 hits와 함께 window의 스풀로 옮김
+    # 직전 로그는 파일마다 따로 모으므로 다른 파일의 로그는 섞이지 않음
+    context_seconds = window.seconds if window is not None else 0
+    workers = workers or min(len(log_paths), os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(scan_file, path, rules_path, spool_dir, miner is not None, context_seconds)
+                for path in log_paths
+            ]
+            results = [future.result() for future in futures]
+        if miner is not None:
+            for _, _, templates in results:
+                miner.merge(templates)
+        spool_paths = [spool_path for spool_path, _, _ in results]
+        return report(merge_problems(spool_paths, window))
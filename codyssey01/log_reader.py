@@ -0,0 +1,92 @@
+import bz2
+import calendar
+import gzip
+import lzma
+import os
+
+BLOCK_SIZE = 64 * 1024  # 역방향 읽기에 사용하는 블록 크기(바이트)
+
+# 파일 앞부분의 매직 바이트로 압축 형식을 먼저 판단하고, 없으면 확장자로 판단
+COMPRESSED_MAGIC = [
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+]
+COMPRESSED_EXTENSIONS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def find_opener(filename):
+    with open(filename, 'rb') as f:
+        head = f.read(6)
+    for magic, opener in COMPRESSED_MAGIC:
+        if head.startswith(magic):
+            return opener
+    return COMPRESSED_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def is_compressed(filename):
+    return find_opener(filename) is not None
+
+
+def check_plain(filename, feature):
+    # 바이트 위치로 이동해야 하는 기능은 압축 파일에서 쓸 수 없음
+    if is_compressed(filename):
+        raise ValueError(f'압축된 로그에서는 사용할 수 없는 기능({feature}): {filename}')
+
+
+def open_log(filename):
+    # 압축 파일은 스트리밍으로 풀면서 읽음 (디스크에 풀어두거나 메모리에 전부 올리지 않음)
+    opener = find_opener(filename)
+    if opener is None:
+        return open(filename, 'r', encoding='UTF-8')
+    return opener(filename, 'rt', encoding='UTF-8')
+
+
+def iter_lines(filename, skip_header=True):
+    # 로그를 한 줄씩 읽어서 돌려주는 제너레이터 (파일 전체를 메모리에 올리지 않음)
+    with open_log(filename) as r:
+        if skip_header:
+            r.readline()  # timestamp,event,message 헤더는 건너뜀
+        for line in r:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line
+
+
+def iter_lines_reverse(filename, skip_header=True, block_size=BLOCK_SIZE):
+    # 파일 끝에서부터 고정 크기 블록을 거꾸로 읽어 마지막 줄부터 돌려줌
+    check_plain(filename, '역방향 읽기')
+    with open(filename, 'rb') as f:
+        header_end = 0
+        if skip_header:
+            f.readline()
+            header_end = f.tell()
+
+        position = f.seek(0, os.SEEK_END)
+        rest = b''  # 블록 경계에 걸려서 아직 완성되지 않은 줄의 앞부분
+        while position > header_end:
+            size = min(block_size, position - header_end)
+            position -= size
+            f.seek(position)
+            block = f.read(size) + rest
+            lines = block.split(b'\n')
+            rest = lines[0]  # 맨 앞 조각은 이전 블록과 이어질 수 있음
+            for line in reversed(lines[1:]):
+                line = line.rstrip(b'\r')
+                if line:
+                    yield line.decode('UTF-8')
+        rest = rest.rstrip(b'\r')
+        if rest:
+            yield rest.decode('UTF-8')
+
+
+def parse_timestamp(text):
+    # 'YYYY-MM-DD HH:MM:SS' 형식을 epoch 초(int)로 변환 (strptime보다 빠르게 슬라이싱으로 처리)
+    return calendar.timegm((
+        int(text[0:4]), int(text[5:7]), int(text[8:10]),
+        int(text[11:13]), int(text[14:16]), int(text[17:19]), 0, 0, 0
+    ))
@@ -0,0 +1,74 @@
+import csv
+import re
+
+RULES_PATH = 'codyssey01/incident_rules.csv'
+
+
+def load_rules(filename):
+    # 규칙 파일 형식: name,kind,pattern,level,description
+    #   kind = keyword(문자열 포함), regex(정규식), level(이벤트 등급만 검사)
+    #   level 값이 있으면 해당 이벤트 등급인 줄에만 적용
+    rules = []
+    with open(filename, 'r', encoding='UTF-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if not row['name'] or row['name'].startswith('#'):
+                continue
+            kind = row['kind'].strip()
+            if kind not in ('keyword', 'regex', 'level'):
+                raise ValueError(f'알 수 없는 규칙 종류: {kind} ({row["name"]})')
+            rules.append({
+                'name': row['name'].strip(),
+                'kind': kind,
+                'pattern': row['pattern'] or '',
+                'level': (row['level'] or '').strip(),
+                'description': (row.get('description') or '').strip(),
+            })
+    return rules
+
+
+class RuleMatcher:
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.order = {rule['name']: i for i, rule in enumerate(rules)}  # 보고서 정렬용
+        self.pattern_rules = []  # (규칙, 개별 정규식) 목록
+        self.level_rules = {}  # 이벤트 등급 -> 등급만 검사하는 규칙 이름 목록
+        parts = []
+        for rule in rules:
+            if rule['kind'] == 'level':
+                self.level_rules.setdefault(rule['level'], []).append(rule['name'])
+                continue
+            if rule['kind'] == 'keyword':
+                pattern = re.escape(rule['pattern'])
+            else:
+                pattern = rule['pattern']
+            self.pattern_rules.append((rule, re.compile(pattern)))
+            parts.append(f'(?:{pattern})')
+        # 모든 키워드/정규식을 하나로 합친 정규식으로 한 번만 검사해서
+        # 아무 규칙에도 걸리지 않는 대부분의 줄은 바로 넘어감
+        self.combined = re.compile('|'.join(parts)) if parts else None
+
+    def match(self, line):
+        # 줄이 걸린 모든 규칙 이름을 규칙 파일 순서대로 돌려줌
+        parts = line.split(',', 2)
+        level = parts[1] if len(parts) > 1 else ''
+        names = list(self.level_rules.get(level, ()))
+        if self.combined is not None and self.combined.search(line):
+            for rule, regex in self.pattern_rules:
+                if rule['level'] and rule['level'] != level:
+                    continue
+                if regex.search(line):
+                    names.append(rule['name'])
+        if len(names) > 1:
+            names.sort(key=self.order.get)
+        return names
+
+
+def scan_problems(lines, matcher, echo=False):
+    # 규칙에 걸린 줄만 (줄, 규칙 이름 목록) 형태로 돌려줌
+    for line in lines:
+        if echo:
+            print(line)
+        names = matcher.match(line)
+        if names:
+            yield line, names
@@ -0,0 +1,42 @@
+import mmap
+import os
+import re
+
+from log_reader import check_plain
+
+
+def search_log(filename, pattern, regex=False, ignore_case=False):
+    # 로그 전체를 문자열로 바꾸지 않고, 메모리 매핑된 바이트에서 바로 검색
+    # 일치한 줄만 앞뒤 줄바꿈 위치를 찾아서 잘라낸 뒤 문자열로 변환
+    check_plain(filename, 'mmap 검색')
+    needle = pattern.encode('UTF-8')
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if regex or ignore_case:
+                compiled = re.compile(
+                    needle if regex else re.escape(needle),
+                    re.IGNORECASE if ignore_case else 0
+                )
+
+                def find(position):
+                    match = compiled.search(mm, position)
+                    return match.start() if match else -1
+            else:
+                def find(position):
+                    return mm.find(needle, position)  # 단순 문자열은 bytes.find와 같은 C 검색
+
+            position = mm.find(b'\n') + 1  # 헤더 줄은 검색하지 않음
+            if position == 0:
+                return
+            while True:
+                hit = find(position)
+                if hit < 0:
+                    break
+                start = mm.rfind(b'\n', 0, hit) + 1
+                end = mm.find(b'\n', hit)
+                if end < 0:
+                    end = len(mm)
+                yield mm[start:end].rstrip(b'\r').decode('UTF-8')
+                position = end + 1  # 한 줄에 여러 번 나와도 한 번만 출력
@@ -0,0 +1,95 @@
+import re
+
+WILDCARD = '<*>'
+HAS_DIGIT = re.compile(r'\d')
+
+
+def tokenize(message):
+    # 숫자가 들어간 토큰(시간, 수치, ID 등)은 처음부터 변수로 취급
+    return [WILDCARD if HAS_DIGIT.search(token) else token for token in message.split()]
+
+
+def similarity(template, tokens):
+    # Drain 방식: 같은 위치의 토큰이 일치하는 비율 (이미 변수가 된 자리는 제외)
+    if not tokens:
+        return 1.0
+    same = 0
+    for left, right in zip(template, tokens):
+        if left == right and left != WILDCARD:
+            same += 1
+    return same / len(tokens)
+
+
+class TemplateMiner:
+    # Drain과 비슷한 온라인 템플릿 추출기
+    # (이벤트 등급, 토큰 수, 첫 토큰)으로 후보 그룹을 좁힌 뒤 그 안에서 가장 비슷한 템플릿에 합침
+    # 메모리는 로그 줄 수가 아니라 템플릿 수에 비례함
+
+    def __init__(self, threshold=0.5, cache_size=10000):
+        self.threshold = threshold
+        self.groups = {}  # (event, 토큰 수, 첫 토큰) -> 템플릿 목록
+        self.templates = []  # 생성된 순서대로 보관
+        # 정상 로그는 완전히 같은 메시지가 반복되므로, 이미 본 메시지는 토큰화 없이 바로 찾음
+        self.cache = {}  # (event, message) -> 템플릿
+        self.cache_size = cache_size
+
+    def add(self, timestamp, event, message, count=1, last=None):
+        cached = self.cache.get((event, message))
+        if cached is not None:
+            # 이미 이 템플릿에 합쳐진 메시지라서 다시 합쳐도 토큰은 바뀌지 않음
+            cached['count'] += count
+            cached['first'] = min(cached['first'], timestamp)
+            cached['last'] = max(cached['last'], last or timestamp)
+            return cached
+
+        tokens = tokenize(message)
+        first = tokens[0] if tokens else ''
+        group = self.groups.setdefault((event, len(tokens), first), [])
+
+        best = None
+        best_score = -1.0
+        for template in group:
+            score = similarity(template['tokens'], tokens)
+            if score > best_score:
+                best, best_score = template, score
+
+        if best is None or best_score < self.threshold:
+            best = {
+                'event': event,
+                'tokens': tokens,
+                'count': 0,
+                'first': timestamp,
+                'last': last or timestamp,
+            }
+            group.append(best)
+            self.templates.append(best)
+        else:
+            # 서로 다른 위치는 변수(<*>)로 바꿔서 템플릿을 일반화
+            best['tokens'] = [
+                left if left == right else WILDCARD
+                for left, right in zip(best['tokens'], tokens)
+            ]
+            best['first'] = min(best['first'], timestamp)
+            best['last'] = max(best['last'], last or timestamp)
+        best['count'] += count
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()  # 캐시가 cache_size 이상으로 커지지 않도록 비움
+        self.cache[(event, message)] = best
+        return best
+
+    def feed(self, lines):
+        # 줄을 그대로 흘려보내면서 템플릿만 갱신 (다른 분석과 같은 한 번의 순회에서 처리)
+        for line in lines:
+            parts = line.split(',', 2)
+            if len(parts) == 3:
+                self.add(parts[0], parts[1], parts[2])
+            yield line
+
+    def merge(self, templates):
+        # 다른 프로세스에서 만든 템플릿 목록을 건수와 시간 범위를 유지한 채 합침
+        for template in templates:
+            self.add(template['first'], template['event'], ' '.join(template['tokens']),
+                     count=template['count'], last=template['last'])
+
+    def summary(self):
+        return sorted(self.templates, key=lambda template: template['count'], reverse=True)
@@ -1,46 +1,280 @@
-print('Hello Mars')
+import argparse
+import os
 
-try:
-    with open('codyssey01/mission_computer_main.log', 'r') as r:  # 'r'은 읽기 형식으로 불러옴
-        str = r.read()
-except Exception as e:
-    print(e)
+from log_columnar import ColumnarLog, columnar_path_for, convert_log
+from log_correlate import ContextWindow
+from log_follow import CHECKPOINT_PATH, follow_log
+from log_index import query_range
+from log_parallel import analyze_files, find_log_files
+from log_reader import iter_lines, iter_lines_reverse
+from log_rules import RULES_PATH, RuleMatcher, load_rules, scan_problems
+from log_search import search_log
+from log_template import TemplateMiner
 
-print('---로그파일 출력---')
-print(str)
+LOG_PATH = 'codyssey01/mission_computer_main.log'
+PROBLEM_PATH = 'codyssey01/problem.txt'
+ANALYSIS_PATH = 'codyssey01/log_analysis.md'
 
-pb = []  # 문제가 되는 부분을 저장하기 위한 리스트
+REPORT_HEADER = '''로그 분석 보고서
 
-print('---보너스 1---')
-list = str.split('\n')  # 로그를 줄바꿈 단위로 리스트로 변환
-list.reverse()  # 리스트를 시간 역순으로 바꿈
-for i in range(1, len(list)-1):
-    if 'Oxygen tank' in list[i]:
-        pb.append(list[i])
-    print(list[i])
+사고 원인 분석
+산소 탱크가 불안정하여 폭발함.
 
-pb.sort()  # pb가 시간 역순으로 들어가 있으니 다시 정렬
+관련 로그
+'''
 
-try:
-    with open('codyssey01/problem.txt', 'w') as problem:  # codyssey01 경로에 저장
-        for i in pb:
-            problem.write(i + '\n')  # 줄바꿈 추가
-except Exception as e:
-    print(e)
 
+def write_problems(hits, matcher, problem, mode):
+    # problem.txt는 순회하면서 바로 쓰고, 보고서용으로는 규칙별로 묶어서 돌려줌
+    # 메모리에는 문제 로그만 남으므로 로그 크기가 아니라 사고 건수에 비례함
+    grouped = {rule['name']: [] for rule in matcher.rules}
+    count = 0
+    with open(problem, mode) as f:
+        for line, names in hits:
+            f.write(line + '\n')  # 줄바꿈 추가
+            for name in names:
+                grouped[name].append(line)
+            count += 1
+    return grouped, count
 
-text = '''로그 분석 보고서  
 
-사고 원인 분석  
-산소 탱크가 불안정하여 폭발함.
+def write_grouped(analysis, grouped, matcher, window=None):
+    for rule in matcher.rules:
+        lines = grouped[rule['name']]
+        if not lines:
+            continue
+        title = rule['description'] or rule['name']
+        analysis.write(f'\n### {title} ({rule["name"]}, {len(lines)}건)\n')
+        for log in lines:
+            analysis.write(f'- {log}\n')
+            if window is not None:  # 사고 직전 로그를 하위 목록으로 표시
+                context = window.context(log)  # 스풀에서 이 사고의 직전 로그만 읽음
+                analysis.write(f'  - 직전 {window.seconds // 60}분 로그 {len(context)}줄\n')
+                for recent in context:
+                    analysis.write(f'    - {recent}\n')
 
-관련 로그
-'''
-for log in pb:
-    text += f'- {log}\n'
-
-try:
-    with open('codyssey01/log_analysis.md', 'w', encoding='UTF-8') as analysis:
-        analysis.write(text)
-except Exception as e:
-    print(e)
\ No newline at end of file
+
+def write_templates(analysis, miner):
+    # 같은 모양의 메시지를 하나로 묶어서 원본 줄 대신 요약표로 보여줌
+    templates = miner.summary()
+    analysis.write(f'\n메시지 템플릿 요약 ({len(templates)}종)\n\n')
+    analysis.write('| 건수 | 등급 | 템플릿 | 처음 | 마지막 |\n')
+    analysis.write('|---:|---|---|---|---|\n')
+    for template in templates:
+        text = ' '.join(template['tokens']).replace('|', '\\|')
+        analysis.write(
+            f'| {template["count"]} | {template["event"]} | {text} '
+            f'| {template["first"]} | {template["last"]} |\n'
+        )
+
+
+def write_reports(hits, matcher, problem_path, analysis_path, miner=None, window=None):
+    grouped, count = write_problems(hits, matcher, problem_path, 'w')
+    with open(analysis_path, 'w', encoding='UTF-8') as analysis:
+        analysis.write(REPORT_HEADER)
+        write_grouped(analysis, grouped, matcher, window)
+        if miner is not None:  # hits를 다 읽은 뒤이므로 템플릿도 전체 로그 기준으로 완성된 상태
+            write_templates(analysis, miner)
+    if window is not None:  # 보고서를 다 썼으므로 직전 로그 스풀은 지움
+        window.close()
+    return count
+
+
+def append_reports(hits, matcher, problem_path, analysis_path):
+    # follow 모드용: 기존 보고서를 다시 쓰지 않고 새로 찾은 문제 로그만 덧붙임
+    grouped, _ = write_problems(hits, matcher, problem_path, 'a')
+    new_report = not os.path.exists(analysis_path)
+    with open(analysis_path, 'a', encoding='UTF-8') as analysis:
+        if new_report:
+            analysis.write(REPORT_HEADER)
+        analysis.write(f'\n## {hits[0][0][:19]} ~ {hits[-1][0][:19]} 추가 분석\n')
+        write_grouped(analysis, grouped, matcher)
+
+
+def build_pipeline(lines, matcher, echo=False, context_minutes=5):
+    # 템플릿 추출, 직전 로그 창, 규칙 검사를 한 번의 순회로 묶음
+    miner = TemplateMiner()
+    lines = miner.feed(lines)
+    window = None
+    if context_minutes > 0:
+        window = ContextWindow(context_minutes * 60)
+        lines = window.feed(lines)
+    hits = scan_problems(lines, matcher, echo=echo)
+    if window is not None:
+        hits = window.keep(window.capture(hits))
+    return hits, miner, window
+
+
+def analyze_log(log_path, problem_path, analysis_path, matcher, echo=True, context_minutes=5):
+    # 로그를 한 번만 순회하면서 출력, 문제 로그 필터링, 보고서 작성을 같이 처리
+    # 로그는 시간 순서대로 기록되어 있으므로 따로 정렬할 필요가 없음
+    hits, miner, window = build_pipeline(iter_lines(log_path), matcher, echo, context_minutes)
+    return write_reports(hits, matcher, problem_path, analysis_path, miner, window)
+
+
+def print_reverse(log_path):
+    for line in iter_lines_reverse(log_path):  # 파일 끝에서부터 시간 역순으로 출력
+        print(line)
+
+
+def analyze_many(pattern, rules_path, problem_path, analysis_path, workers=None, context_minutes=5):
+    # 여러 로그 파일을 프로세스 풀에서 동시에 분석하고 시간순으로 병합해서 보고서 작성
+    log_paths = find_log_files(pattern)
+    if not log_paths:
+        print(f'로그 파일을 찾을 수 없음: {pattern}')
+        return 0
+    print(f'---로그 파일 {len(log_paths)}개 분석---')
+    matcher = RuleMatcher(load_rules(rules_path))
+    miner = TemplateMiner()
+    window = ContextWindow(context_minutes * 60) if context_minutes > 0 else None
+    count = analyze_files(
+        log_paths, rules_path,
+        lambda hits: write_reports(hits, matcher, problem_path, analysis_path, miner, window),
+        workers=workers, miner=miner, window=window
+    )
+    print(f'문제 로그 {count}건')
+    return count
+
+
+def follow(log_path, rules_path, problem_path, analysis_path, checkpoint_path, interval):
+    # 체크포인트가 없으면 처음 시작하는 것이므로 이전 보고서를 지우고 새로 작성
+    if not os.path.exists(checkpoint_path):
+        for path in (problem_path, analysis_path):
+            if os.path.exists(path):
+                os.remove(path)
+    matcher = RuleMatcher(load_rules(rules_path))
+    print(f'---{log_path} 감시 시작 (종료: Ctrl+C)---')
+    follow_log(
+        log_path, matcher,
+        lambda hits: append_reports(hits, matcher, problem_path, analysis_path),
+        checkpoint_path=checkpoint_path, interval=interval
+    )
+
+
+def complete_timestamp(text, log_path, seconds='00'):
+    # '11:30' 처럼 시각만 주면 로그 첫 줄의 날짜를 붙이고, 초가 없으면 채워 넣음
+    text = text.strip()
+    if '-' not in text:
+        first_line = next(iter_lines(log_path), '')
+        text = first_line[:10] + ' ' + text
+    if len(text) == 16:
+        text += ':' + seconds
+    return text
+
+
+def print_range(log_path, start, end):
+    start = complete_timestamp(start, log_path)
+    end = complete_timestamp(end, log_path, seconds='59')
+    print(f'---{start} ~ {end} 로그---')
+    for line in query_range(log_path, start, end):
+        print(line)
+
+
+def print_event_counts(log_path, start=None, end=None):
+    # 열 형식 파일이 없거나 로그보다 오래됐으면 먼저 변환하고, 이후 분석은 매핑된 배열로 처리
+    col_path = columnar_path_for(log_path)
+    if not os.path.exists(col_path) or os.path.getmtime(col_path) < os.path.getmtime(log_path):
+        count = convert_log(log_path, col_path)
+        print(f'열 형식 변환 완료: {col_path} ({count}줄)')
+    if start or end:
+        start = complete_timestamp(start or '00:00', log_path)
+        end = complete_timestamp(end or '23:59', log_path, seconds='59')
+    with ColumnarLog(col_path) as log:
+        rows = log.select_rows(start, end)
+        print(f'---이벤트 등급별 건수 ({len(rows)}줄)---')
+        for event, count in sorted(log.count_by_event(rows).items()):
+            print(f'{event:<10} {count}')
+
+
+def print_search(log_path, pattern, regex=False, ignore_case=False):
+    print(f'---"{pattern}" 검색 결과---')
+    count = 0
+    for line in search_log(log_path, pattern, regex=regex, ignore_case=ignore_case):
+        print(line)
+        count += 1
+    print(f'{count}줄 일치')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 기지 미션 컴퓨터 로그 분석')
+    parser.add_argument('--log', default=LOG_PATH, help='분석할 로그 파일 경로')
+    parser.add_argument('--glob', help='여러 로그 파일을 한 번에 분석할 glob 패턴 (예: "logs/**/*.log")')
+    parser.add_argument('--workers', type=int, help='--glob 분석에 사용할 프로세스 수 (기본: CPU 개수)')
+    parser.add_argument('--follow', action='store_true', help='로그에 새로 추가되는 줄만 계속 분석')
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help='--follow 진행 위치를 저장할 파일')
+    parser.add_argument('--interval', type=float, default=1.0, help='--follow 확인 주기(초)')
+    parser.add_argument('--convert', action='store_true', help='로그를 열 형식 파일(<로그>.col)로 변환')
+    parser.add_argument('--counts', action='store_true', help='열 형식 파일로 이벤트 등급별 건수 집계 (--start/--end 사용 가능)')
+    parser.add_argument('--search', help='mmap으로 로그에서 문자열을 바로 검색')
+    parser.add_argument('--regex', action='store_true', help='--search 값을 정규식으로 사용')
+    parser.add_argument('--ignore-case', action='store_true', help='--search 대소문자 무시')
+    parser.add_argument('--context-minutes', type=int, default=5, help='사고 로그마다 보고서에 붙일 직전 로그 범위(분), 0이면 생략')
+    parser.add_argument('--rules', default=RULES_PATH, help='사고 탐지 규칙 파일 경로')
+    parser.add_argument('--start', help='구간 조회 시작 시각 (예: 11:30 또는 2023-08-27 11:30:00)')
+    parser.add_argument('--end', help='구간 조회 종료 시각')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print('Hello Mars')
+
+    if args.search:
+        try:
+            print_search(args.log, args.search, args.regex, args.ignore_case)
+        except Exception as e:
+            print(e)
+        return
+
+    if args.convert:
+        try:
+            count = convert_log(args.log)
+            print(f'열 형식 변환 완료: {columnar_path_for(args.log)} ({count}줄)')
+        except Exception as e:
+            print(e)
+        return
+
+    if args.counts:
+        try:
+            print_event_counts(args.log, args.start, args.end)
+        except Exception as e:
+            print(e)
+        return
+
+    if args.start or args.end:  # 구간 조회는 인덱스를 이용해 해당 위치로 바로 이동
+        try:
+            print_range(args.log, args.start or '00:00', args.end or '23:59')
+        except Exception as e:
+            print(e)
+        return
+
+    if args.follow:
+        try:
+            follow(args.log, args.rules, PROBLEM_PATH, ANALYSIS_PATH, args.checkpoint, args.interval)
+        except Exception as e:
+            print(e)
+        return
+
+    if args.glob:
+        try:
+            analyze_many(args.glob, args.rules, PROBLEM_PATH, ANALYSIS_PATH, args.workers, args.context_minutes)
+        except Exception as e:
+            print(e)
+        return
+
+    print('---로그파일 출력---')
+    try:
+        matcher = RuleMatcher(load_rules(args.rules))
+        analyze_log(args.log, PROBLEM_PATH, ANALYSIS_PATH, matcher, context_minutes=args.context_minutes)
+    except Exception as e:
+        print(e)
+
+    print('---보너스 1---')
+    try:
+        print_reverse(args.log)
+    except Exception as e:
+        print(e)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import time
+
+FORMATS = ['csv', 'jsonl', 'binary', 'binary-zlib']
+RESULTS_PATH = 'codyssey02/bench_results.csv'
+RESULT_FIELDS = ['time', 'rows', 'format', 'bytes', 'write_s', 'read_s', 'sort_s', 'filter_s',
+                 'peak_rss_mb', 'seed', 'error']
+HEADER = ['Substance', 'Weight (g/cm³)', 'Specific Gravity', 'Strength', 'Flammability']
+STRENGTHS = ['Very weak', 'Weak', 'Low', 'Medium', 'High', 'Very high', 'Various']
+THRESHOLD = 0.7
+
+
+def parse_count(text):
+    # '10k', '1M' 같은 행 수 표기를 정수로 바꿈
+    text = text.strip().upper()
+    units = {'K': 1000, 'M': 1000 * 1000}
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def generate_inventory(filename, rows, seed=0):
+    # 원본 CSV와 비슷한 분포: 무게/비중은 40%가 'Various', 강도는 몇 가지 값이 반복, 인화성은 소수 둘째 자리
+    rng = random.Random(seed)
+    with open(filename, 'w', encoding='UTF-8') as f:
+        f.write(','.join(HEADER) + '\n')
+        lines = []
+        for i in range(rows):
+            if rng.random() < 0.4:
+                weight = gravity = 'Various'
+            else:
+                weight = gravity = f'{rng.uniform(0.5, 20):.3f}'
+            lines.append(f'Item{i},{weight},{gravity},{rng.choice(STRENGTHS)},{rng.randint(0, 100) / 100}\n')
+            if len(lines) >= 10000:
+                f.writelines(lines)
+                lines = []
+        f.writelines(lines)
+
+
+def format_path(work_dir, rows, seed, fmt):
+    extension = {'csv': 'csv', 'jsonl': 'jsonl', 'binary': 'bin', 'binary-zlib': 'zlib.bin'}[fmt]
+    return os.path.join(work_dir, f'out_{rows}_seed{seed}.{extension}')
+
+
+def write_format(fmt, source, path):
+    # 원본 CSV를 한 줄씩 읽어서 각 형식으로 씀 (원본 파싱 비용은 모든 형식에 똑같이 들어감)
+    from inventory_format import KIND_FLOAT, KIND_STRING, InventoryWriter
+    from inventory_sort import iter_csv
+
+    rows = iter_csv(source)
+    header = next(rows)
+    if fmt == 'csv':
+        with open(path, 'w', encoding='UTF-8') as f:
+            f.write(','.join(header) + '\n')
+            for row in rows:
+                f.write(','.join(row) + '\n')
+    elif fmt == 'jsonl':
+        with open(path, 'w', encoding='UTF-8') as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n')
+    else:
+        schema = [(name, KIND_FLOAT if name == 'Flammability' else KIND_STRING) for name in header]
+        with InventoryWriter(path, schema, compression='zlib' if fmt == 'binary-zlib' else None) as writer:
+            writer.write_rows(rows)
+
+
+def read_format(fmt, path):
+    # 모든 행을 값 목록으로 디코딩 (메모리에 모아두지 않고 개수만 셈)
+    from inventory_format import InventoryFile
+    from inventory_sort import iter_csv
+
+    count = 0
+    if fmt == 'csv':
+        rows = iter_csv(path)
+        next(rows)
+        for _ in rows:
+            count += 1
+    elif fmt == 'jsonl':
+        with open(path, 'r', encoding='UTF-8') as f:
+            for line in f:
+                list(json.loads(line).values())
+                count += 1
+    else:
+        with InventoryFile(path) as inventory:
+            for _ in inventory.rows():
+                count += 1
+    return count
+
+
+def flammability_column(fmt, path):
+    # 인화성 열만 float64 배열로 읽음 (이진 형식은 파일을 그대로 배열로 봄)
+    import numpy as np
+
+    from inventory_format import to_float
+    from inventory_sort import iter_csv
+
+    if fmt == 'csv':
+        rows = iter_csv(path)
+        col = next(rows).index('Flammability')
+        return np.fromiter((to_float(row[col]) for row in rows), dtype=np.float64)
+    if fmt == 'jsonl':
+        with open(path, 'r', encoding='UTF-8') as f:
+            return np.fromiter((to_float(json.loads(line)['Flammability']) for line in f), dtype=np.float64)
+    return None
+
+
+def sort_format(fmt, path):
+    # 인화성 내림차순 정렬 순서(행 번호)를 구함, NaN은 맨 뒤
+    import numpy as np
+
+    from inventory_format import InventoryFile
+
+    values = flammability_column(fmt, path)
+    if values is None:
+        with InventoryFile(path) as inventory:
+            values = np.frombuffer(inventory.numeric_column('Flammability'), dtype='<f8')
+            order = np.argsort(-values, kind='stable')
+            del values  # 파일을 닫기 전에 mmap을 가리키는 배열을 놓아줌
+            return len(order)
+    return len(np.argsort(-values, kind='stable'))
+
+
+def filter_format(fmt, path):
+    # 인화성 THRESHOLD 이상인 행을 모두 읽어서 개수를 돌려줌
+    import numpy as np
+
+    from inventory_format import InventoryFile, to_float
+    from inventory_sort import iter_csv
+
+    count = 0
+    if fmt == 'csv':
+        rows = iter_csv(path)
+        col = next(rows).index('Flammability')
+        for row in rows:
+            if to_float(row[col]) >= THRESHOLD:
+                count += 1
+    elif fmt == 'jsonl':
+        with open(path, 'r', encoding='UTF-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if to_float(record['Flammability']) >= THRESHOLD:
+                    count += 1
+    else:
+        with InventoryFile(path) as inventory:
+            values = np.frombuffer(inventory.numeric_column('Flammability'), dtype='<f8')
+            selected = np.flatnonzero(values >= THRESHOLD).tolist()
+            del values
+            for row in selected:
+                inventory.row(row)
+                count += 1
+    return count
+
+
+def measure(fmt, source, path, queue):
+    # 자식 프로세스에서 실행되어 최대 메모리(RSS)가 다른 형식과 섞이지 않도록 함
+    try:
+        import numpy  # noqa: F401  모듈을 불러오는 시간은 측정에서 뺌
+        import inventory_format  # noqa: F401
+        import inventory_sort  # noqa: F401
+
+        result = {}
+        for name, run in (('write_s', lambda: write_format(fmt, source, path)),
+                          ('read_s', lambda: read_format(fmt, path)),
+                          ('sort_s', lambda: sort_format(fmt, path)),
+                          ('filter_s', lambda: filter_format(fmt, path))):
+            started = time.perf_counter()
+            run()
+            result[name] = round(time.perf_counter() - started, 4)
+        result['bytes'] = os.path.getsize(path)
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # 리눅스는 KB 단위
+        result['peak_rss_mb'] = round(peak_kb / 1024, 1)
+        queue.put(result)
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def run_benchmark(sizes, formats, seed, work_dir, results_path, keep=False):
+    os.makedirs(work_dir, exist_ok=True)
+    context = multiprocessing.get_context('spawn')  # fork하면 부모의 메모리 사용량이 섞임
+    records = []
+    for size in sizes:
+        rows = parse_count(size)
+        source = os.path.join(work_dir, f'inventory_{rows}_seed{seed}.csv')
+        if not os.path.exists(source):
+            print(f'인벤토리 생성: {source}')
+            generate_inventory(source, rows, seed)
+        for fmt in formats:
+            path = format_path(work_dir, rows, seed, fmt)
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(fmt, source, path, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            if not keep and os.path.exists(path):
+                os.remove(path)
+            record = {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'rows': rows, 'format': fmt, 'seed': seed}
+            record.update(result)
+            records.append(record)
+            save_record(record, results_path)
+    print_table(records)
+    return records
+
+
+def save_record(record, results_path):
+    # 실행마다 누적해서 추이를 볼 수 있게 함
+    new_file = not os.path.exists(results_path)
+    with open(results_path, 'a', encoding='UTF-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerow(record)
+
+
+def print_table(records):
+    print('─────────────────────────────────────────────────────────────────────────────────────────────')
+    print(f'{"rows":>11} {"format":<12} {"size(MB)":>9} {"write(s)":>9} {"read(s)":>9} '
+          f'{"sort(s)":>9} {"filter(s)":>9} {"RSS(MB)":>9}')
+    print('─────────────────────────────────────────────────────────────────────────────────────────────')
+    for record in records:
+        if 'error' in record:
+            print(f'{record["rows"]:>11,} {record["format"]:<12} 오류: {record["error"]}')
+            continue
+        print(f'{record["rows"]:>11,} {record["format"]:<12} {record["bytes"] / 1024 / 1024:>9.1f} '
+              f'{record["write_s"]:>9.2f} {record["read_s"]:>9.2f} {record["sort_s"]:>9.2f} '
+              f'{record["filter_s"]:>9.2f} {record["peak_rss_mb"]:>9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인벤토리 저장 형식 비교 벤치마크')
+    parser.add_argument('--sizes', default='10k,100k,1M', help='쉼표로 구분한 행 수 (예: 10k,100k,1M,10M)')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='측정할 형식: ' + ', '.join(FORMATS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', default='codyssey02/bench')
+    parser.add_argument('--results', default=RESULTS_PATH, help='결과를 CSV로 누적 저장할 파일')
+    parser.add_argument('--keep', action='store_true', help='측정에 쓴 형식별 파일을 지우지 않음')
+    args = parser.parse_args()
+
+    run_benchmark(
+        [size.strip() for size in args.sizes.split(',') if size.strip()],
+        [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()],
+        args.seed, args.work_dir, args.results, args.keep
+    )
+
+
+if __name__ == '__main__':
+    main()
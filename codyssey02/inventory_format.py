@@ -0,0 +1,575 @@
+import lzma
+import math
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+# 파일 구조
+#   헤더      : magic, 버전, 플래그, 행 수, 열 수
+#   열 정의   : 열마다 (종류, 인코딩, 이름 길이) + 이름(UTF-8)
+#   열 목록   : 열마다 (데이터 위치, 데이터 길이, 보조 데이터 위치, 보조 데이터 길이)
+#   데이터    : 숫자 열은 float64 고정 폭 배열
+#               문자열 열은 데이터 = 오프셋 테이블(uint64, 행 수 + 1개), 보조 데이터 = 문자열 힙
+#               사전 인코딩 문자열 열은 데이터 = 코드 배열(uint8/uint16),
+#               보조 데이터 = 사전 항목 수(uint64) + 오프셋 테이블(uint64, 항목 수 + 1개) + 문자열 힙
+# 모든 섹션은 8바이트 경계에서 시작하고 숫자는 리틀 엔디언으로 저장
+# 헤더 플래그에 압축 방식이 있으면 각 섹션은 블록 단위로 따로 압축해서 저장
+#   (원래 길이, 블록 크기, 블록 수) + 블록 위치 테이블(uint64, 블록 수 + 1개, 섹션 시작 기준) + 압축된 블록들
+#   데이터 섹션의 블록은 BLOCK_ROWS행 분량이라 행 번호로 블록을 바로 찾고, 읽을 때는 필요한 블록만 풂
+#   (버전 2 파일은 섹션마다 원래 길이(uint64) + 하나로 압축된 바이트)
+MAGIC = b'MINVBIN1'
+VERSION = 3
+HEADER = struct.Struct('<8sHHQI4x')
+COLUMN = struct.Struct('<BBH')
+DIRECTORY = struct.Struct('<QQQQ')
+RAW_LENGTH = struct.Struct('<Q')
+BLOCK_TABLE = struct.Struct('<QQQ')
+
+KIND_FLOAT = 0
+KIND_STRING = 1
+KIND_NAMES = {KIND_FLOAT: 'float64', KIND_STRING: 'string'}
+
+ENCODING_PLAIN = 0
+ENCODING_DICT8 = 1
+ENCODING_DICT16 = 2
+ENCODING_NAMES = {ENCODING_PLAIN: 'plain', ENCODING_DICT8: 'dict8', ENCODING_DICT16: 'dict16'}
+CODE_TYPES = {ENCODING_DICT8: 'B', ENCODING_DICT16: 'H'}
+DICTIONARY_LIMIT = 65536  # 서로 다른 값이 이보다 많으면 사전 인코딩을 포기
+
+FLAG_ZLIB = 1
+FLAG_LZMA = 2
+COMPRESSION_FLAGS = {None: 0, 'zlib': FLAG_ZLIB, 'lzma': FLAG_LZMA}
+
+CHUNK = 64 * 1024  # 임시 파일로 내보내기 전에 모아두는 행 수
+BLOCK_ROWS = 64 * 1024  # 압축할 때 한 블록에 넣는 행 수 (문자열 힙은 BLOCK_ROWS * 8바이트씩)
+SCAN_CHUNK_ROWS = 1024  # scan()이 열 단위로 한 번에 디코딩하는 행 수 (작을수록 CPU 캐시 안에서 처리됨)
+
+
+def to_float(text):
+    # 숫자가 아닌 값('Various' 등)은 NaN으로 저장
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def infer_schema(header, rows):
+    # 모든 값이 숫자인 열만 float64로, 나머지는 문자열 열로 저장
+    numeric = [True] * len(header)
+    for row in rows:
+        for i, item in enumerate(row):
+            if numeric[i] and not is_number(item):
+                numeric[i] = False
+    return [(name, KIND_FLOAT if numeric[i] else KIND_STRING) for i, name in enumerate(header)]
+
+
+def format_value(value):
+    # 출력용 문자열 변환 (NaN은 빈 칸)
+    if isinstance(value, float):
+        return '' if math.isnan(value) else repr(value)
+    return value
+
+
+def to_little_endian(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def pad8(f):
+    f.write(b'\0' * (-f.tell() % 8))
+
+
+def compress_block(flags, data):
+    if flags & FLAG_ZLIB:
+        return zlib.compress(data, 6)
+    return lzma.compress(data)
+
+
+def decompress_block(flags, data, raw_len):
+    if flags & FLAG_ZLIB:
+        return zlib.decompress(data, bufsize=max(raw_len, 1))
+    return lzma.decompress(data)
+
+
+def read_chunks(path, code_type=None):
+    # 임시 파일을 CHUNK 단위로 읽음, code_type이 있으면 uint16 코드를 그 형식으로 좁혀서 돌려줌
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK * 8)
+            if not chunk:
+                break
+            if code_type is not None:
+                codes = array('H')
+                codes.frombytes(chunk)
+                if sys.byteorder != 'little':
+                    codes.byteswap()
+                chunk = to_little_endian(array(code_type, codes)).tobytes()
+            yield chunk
+
+
+class InventoryWriter:
+    # 행을 하나씩 받아서 열별 임시 파일에 나눠 쓰고, close()에서 한 파일로 합침
+    # 전체 데이터를 메모리에 올리지 않으므로 행 수와 상관없이 메모리 사용량이 일정함
+    #   dictionary  : 문자열 열의 서로 다른 값이 적으면 사전 + 정수 코드로 저장 (더 작아질 때만)
+    #   compression : None, 'zlib', 'lzma' 중 하나, 모든 섹션을 블록 단위로 압축해서 저장
+
+    def __init__(self, filename, schema, dictionary=True, compression=None):
+        self.filename = filename
+        self.schema = schema
+        self.flags = COMPRESSION_FLAGS[compression]
+        self.count = 0
+        self.temp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(filename)))
+        self.columns = []
+        for i, (name, kind) in enumerate(schema):
+            column = {
+                'kind': kind,
+                'data_path': os.path.join(self.temp_dir, f'{i}.data'),
+                'aux_path': os.path.join(self.temp_dir, f'{i}.aux'),
+                'codes_path': os.path.join(self.temp_dir, f'{i}.codes'),
+                'dictionary': None,
+            }
+            column['data'] = open(column['data_path'], 'wb')
+            column['aux'] = open(column['aux_path'], 'wb')
+            if kind == KIND_FLOAT:
+                column['buffer'] = array('d')
+            else:
+                column['buffer'] = array('Q', [0])  # 오프셋 테이블은 0에서 시작
+                column['heap'] = bytearray()
+                column['heap_size'] = 0
+                if dictionary:
+                    # 일반 형식과 같이 기록하다가, 서로 다른 값이 너무 많아지면 사전 쪽을 버림
+                    column['dictionary'] = {}
+                    column['codes'] = array('H')
+                    column['codes_file'] = open(column['codes_path'], 'wb')
+            self.columns.append(column)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_row(self, row):
+        for column, item in zip(self.columns, row):
+            if column['kind'] == KIND_FLOAT:
+                column['buffer'].append(item if isinstance(item, float) else to_float(item))
+            else:
+                encoded = item.encode('UTF-8')
+                column['heap'] += encoded
+                column['heap_size'] += len(encoded)
+                column['buffer'].append(column['heap_size'])
+                dictionary = column['dictionary']
+                if dictionary is not None:
+                    code = dictionary.get(item)
+                    if code is None:
+                        if len(dictionary) >= DICTIONARY_LIMIT:
+                            self.drop_dictionary(column)
+                            continue
+                        code = dictionary[item] = len(dictionary)
+                    column['codes'].append(code)
+        self.count += 1
+        if self.count % CHUNK == 0:
+            self.flush()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def drop_dictionary(self, column):
+        column['dictionary'] = None
+        column['codes_file'].close()
+        os.remove(column['codes_path'])
+
+    def flush(self):
+        for column in self.columns:
+            to_little_endian(column['buffer']).tofile(column['data'])
+            del column['buffer'][:]
+            if column['kind'] == KIND_STRING:
+                column['aux'].write(column['heap'])
+                column['heap'].clear()
+                if column['dictionary'] is not None:
+                    to_little_endian(column['codes']).tofile(column['codes_file'])
+                    del column['codes'][:]
+
+    def dictionary_sections(self, column):
+        # 사전 인코딩이 일반 형식보다 작으면 (인코딩, 데이터 조각들, 보조 데이터 조각들), 아니면 None
+        dictionary = column['dictionary']
+        if dictionary is None:
+            return None
+        encoding = ENCODING_DICT8 if len(dictionary) <= 256 else ENCODING_DICT16
+        values = [value.encode('UTF-8') for value in dictionary]  # dict는 코드 순서를 유지
+        offsets = array('Q', [0])
+        for value in values:
+            offsets.append(offsets[-1] + len(value))
+        aux = RAW_LENGTH.pack(len(values)) + to_little_endian(offsets).tobytes() + b''.join(values)
+        width = 1 if encoding == ENCODING_DICT8 else 2
+        plain_size = 8 * (self.count + 1) + column['heap_size']
+        if width * self.count + len(aux) >= plain_size:
+            return None
+        return encoding, read_chunks(column['codes_path'], CODE_TYPES[encoding]), [aux]
+
+    def write_section(self, out, chunks, block_size):
+        # 섹션 하나를 쓰고 (위치, 길이)를 돌려줌
+        # 압축할 때는 block_size 바이트씩 따로 압축해서 임시 파일에 모은 뒤, 블록 위치 테이블과 함께 씀
+        pad8(out)
+        position = out.tell()
+        if not self.flags:
+            for chunk in chunks:
+                out.write(chunk)
+            return [position, out.tell() - position]
+
+        offsets = [0]
+        raw_len = 0
+        pending = bytearray()
+        with tempfile.TemporaryFile(dir=self.temp_dir) as blocks:
+            for chunk in chunks:
+                pending += chunk
+                raw_len += len(chunk)
+                while len(pending) >= block_size:
+                    blocks.write(compress_block(self.flags, bytes(pending[:block_size])))
+                    del pending[:block_size]
+                    offsets.append(blocks.tell())
+            if pending:
+                blocks.write(compress_block(self.flags, bytes(pending)))
+                offsets.append(blocks.tell())
+            base = BLOCK_TABLE.size + 8 * len(offsets)
+            out.write(BLOCK_TABLE.pack(raw_len, block_size, len(offsets) - 1))
+            to_little_endian(array('Q', [base + offset for offset in offsets])).tofile(out)
+            blocks.seek(0)
+            shutil.copyfileobj(blocks, out)
+        return [position, out.tell() - position]
+
+    def close(self):
+        self.flush()
+        for column in self.columns:
+            column['data'].close()
+            column['aux'].close()
+            if column['dictionary'] is not None:
+                column['codes_file'].close()
+
+        temp_out = self.filename + '.tmp'
+        try:
+            sections = []
+            for column in self.columns:
+                section = self.dictionary_sections(column) if column['kind'] == KIND_STRING else None
+                if section is None:
+                    section = ENCODING_PLAIN, read_chunks(column['data_path']), read_chunks(column['aux_path'])
+                sections.append(section)
+
+            with open(temp_out, 'wb') as out:
+                out.write(HEADER.pack(MAGIC, VERSION, self.flags, self.count, len(self.schema)))
+                for (name, kind), (encoding, _, _) in zip(self.schema, sections):
+                    encoded = name.encode('UTF-8')
+                    out.write(COLUMN.pack(kind, encoding, len(encoded)))
+                    out.write(encoded)
+                pad8(out)
+                directory_pos = out.tell()
+                out.write(b'\0' * DIRECTORY.size * len(self.schema))
+
+                directory = []
+                for (_, kind), (encoding, data, aux) in zip(self.schema, sections):
+                    # 데이터 섹션은 항목 크기 * BLOCK_ROWS 바이트씩 블록으로 나눠서 행 번호로 블록을 찾을 수 있게 함
+                    width = 1 if encoding == ENCODING_DICT8 else 2 if encoding == ENCODING_DICT16 else 8
+                    directory.append(self.write_section(out, data, width * BLOCK_ROWS)
+                                     + self.write_section(out, aux, 8 * BLOCK_ROWS))
+
+                out.seek(directory_pos)
+                for entry in directory:
+                    out.write(DIRECTORY.pack(*entry))
+            os.replace(temp_out, self.filename)
+        finally:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def abort(self):
+        for column in self.columns:
+            column['data'].close()
+            column['aux'].close()
+            if column['dictionary'] is not None:
+                column['codes_file'].close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+def write_inventory(filename, header, rows, schema=None, dictionary=True, compression=None):
+    schema = schema or infer_schema(header, rows)
+    with InventoryWriter(filename, schema, dictionary, compression) as writer:
+        writer.write_rows(rows)
+    return schema
+
+
+class InventoryFile:
+    # 파일을 메모리 매핑해서 필요한 행만 바로 읽음 (i번째 행 위치를 계산으로 찾으므로 O(1))
+    # 압축된 파일은 읽는 행이 들어있는 블록만 풀어서 보관
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = {}  # 열 번호 -> mmap 위의 memoryview (복사 없이 배열처럼 사용)
+        self.block_tables = {}  # (열 번호, 'data'/'aux') -> (원래 길이, 블록 크기, 블록 위치 목록)
+        self.blocks = {}  # (열 번호, 'data'/'aux', 블록 번호) -> 압축을 푼 바이트
+        self.dictionaries = {}  # 열 번호 -> 사전 인코딩 열의 값 목록
+        magic, self.version, self.flags, self.count, column_count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'인벤토리 이진 파일이 아님: {filename}')
+        if self.version > VERSION:
+            self.close()
+            raise ValueError(f'지원하지 않는 인벤토리 파일 버전: {self.version}')
+        self.compressed = bool(self.flags & (FLAG_ZLIB | FLAG_LZMA))
+
+        position = HEADER.size
+        self.columns = []
+        for _ in range(column_count):
+            kind, encoding, name_len = COLUMN.unpack_from(self.mm, position)
+            position += COLUMN.size
+            name = self.mm[position:position + name_len].decode('UTF-8')
+            position += name_len
+            self.columns.append({'name': name, 'kind': kind, 'encoding': encoding})
+        position += -position % 8
+        for column in self.columns:
+            (column['data_offset'], column['data_len'],
+             column['aux_offset'], column['aux_len']) = DIRECTORY.unpack_from(self.mm, position)
+            position += DIRECTORY.size
+
+        self.header = [column['name'] for column in self.columns]
+
+    def close(self):
+        # mmap을 닫기 전에 내보낸 memoryview를 모두 해제해야 함
+        for view in self.views.values():
+            view.release()
+        self.views.clear()
+        self.blocks.clear()
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def column_index(self, col):
+        return col if isinstance(col, int) else self.header.index(col)
+
+    def block_table(self, col, part):
+        table = self.block_tables.get((col, part))
+        if table is None:
+            column = self.columns[col]
+            offset, length = column[part + '_offset'], column[part + '_len']
+            if self.version < 3:  # 버전 2는 섹션 전체가 하나의 압축 스트림이므로 블록 하나로 봄
+                raw_len = RAW_LENGTH.unpack_from(self.mm, offset)[0]
+                table = raw_len, max(raw_len, 1), [offset + RAW_LENGTH.size, offset + length]
+            else:
+                raw_len, block_size, block_count = BLOCK_TABLE.unpack_from(self.mm, offset)
+                positions = struct.unpack_from(f'<{block_count + 1}Q', self.mm, offset + BLOCK_TABLE.size)
+                table = raw_len, block_size, [offset + position for position in positions]
+            self.block_tables[(col, part)] = table
+        return table
+
+    def block(self, col, part, index):
+        data = self.blocks.get((col, part, index))
+        if data is None:
+            raw_len, block_size, positions = self.block_table(col, part)
+            data = decompress_block(self.flags, self.mm[positions[index]:positions[index + 1]],
+                                    min(block_size, raw_len - index * block_size))
+            self.blocks[(col, part, index)] = data
+        return data
+
+    def read_bytes(self, col, part, start, stop):
+        # 섹션의 [start, stop) 바이트, 압축된 파일은 그 구간이 걸친 블록만 풂
+        if not self.compressed:
+            offset = self.columns[col][part + '_offset']
+            return self.mm[offset + start:offset + stop]
+        if stop <= start:
+            return b''
+        block_size = self.block_table(col, part)[1]
+        first, last = start // block_size, (stop - 1) // block_size
+        data = b''.join(self.block(col, part, index) for index in range(first, last + 1))
+        skip = first * block_size
+        return data[start - skip:stop - skip]
+
+    def section_len(self, col, part):
+        if self.compressed:
+            return self.block_table(col, part)[0]
+        return self.columns[col][part + '_len']
+
+    def typecode(self, col):
+        column = self.columns[col]
+        if column['kind'] == KIND_FLOAT:
+            return 'd'
+        return CODE_TYPES.get(column['encoding'], 'Q')
+
+    def column_view(self, col):
+        # 숫자 열은 float64 배열, 문자열 열은 오프셋(uint64) 배열, 사전 인코딩 열은 코드 배열로 보이는 memoryview
+        # 하나의 버퍼를 캐스팅만 하므로 값을 복사하거나 행마다 객체를 만들지 않음
+        # 압축된 파일은 열 전체가 필요하므로 모든 블록을 풀어서 배열로 만듦 (몇 행만 읽을 때는 column_slice())
+        col = self.column_index(col)
+        view = self.views.get(col)
+        if view is None:
+            typecode = self.typecode(col)
+            if self.compressed:
+                values = array(typecode)
+                values.frombytes(self.read_bytes(col, 'data', 0, self.section_len(col, 'data')))
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                view = memoryview(values)
+            else:
+                column = self.columns[col]
+                raw = memoryview(self.mm)[column['data_offset']:column['data_offset'] + column['data_len']]
+                if sys.byteorder == 'little' or typecode == 'B':
+                    view = raw.cast(typecode)
+                    raw.release()
+                else:  # 빅 엔디언 시스템에서는 한 번 뒤집어서 복사
+                    view = memoryview(to_little_endian(array(typecode, raw)))
+                    raw.release()
+            self.views[col] = view
+        return view
+
+    def column_slice(self, col, start, stop):
+        # 데이터 섹션의 [start, stop) 항목, 압축된 파일은 그 행들이 들어있는 블록만 풀어서 배열로 만듦
+        if not self.compressed or col in self.views:
+            return self.column_view(col)[start:stop]
+        values = array(self.typecode(col))
+        stop = min(stop, self.section_len(col, 'data') // values.itemsize)
+        values.frombytes(self.read_bytes(col, 'data', start * values.itemsize, stop * values.itemsize))
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def item(self, col, row):
+        if not self.compressed or col in self.views:
+            return self.column_view(col)[row]
+        return self.column_slice(col, row, row + 1)[0]
+
+    def numeric_column(self, col):
+        col = self.column_index(col)
+        if self.columns[col]['kind'] != KIND_FLOAT:
+            raise TypeError(f'숫자 열이 아님: {self.header[col]}')
+        return self.column_view(col)
+
+    def dictionary(self, col):
+        # 사전 인코딩 열의 값 목록 (코드 i의 값 = dictionary[i]), 사전 인코딩이 아니면 None
+        col = self.column_index(col)
+        if self.columns[col]['encoding'] not in CODE_TYPES:
+            return None
+        values = self.dictionaries.get(col)
+        if values is None:
+            buffer = self.read_bytes(col, 'aux', 0, self.section_len(col, 'aux'))
+            size = RAW_LENGTH.unpack_from(buffer, 0)[0]
+            offsets = array('Q')
+            offsets.frombytes(buffer[8:8 + 8 * (size + 1)])
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            base = 8 + 8 * (size + 1)
+            values = [bytes(buffer[base + offsets[i]:base + offsets[i + 1]]).decode('UTF-8') for i in range(size)]
+            self.dictionaries[col] = values
+        return values
+
+    def string_column(self, col, start=0, stop=None):
+        # 문자열 열의 [start, stop) 구간을 순서대로 디코딩 (오프셋 배열을 한 번에 읽어서 힙을 잘라냄)
+        col = self.column_index(col)
+        stop = self.count if stop is None else min(stop, self.count)
+        dictionary = self.dictionary(col)
+        if dictionary is not None:
+            return list(map(dictionary.__getitem__, self.column_slice(col, start, stop)))
+        offsets = self.column_slice(col, start, stop + 1)
+        low, high = offsets[0], offsets[-1]
+        data = bytes(self.read_bytes(col, 'aux', low, high))
+        text = data.decode('UTF-8')
+        bounds = [offset - low for offset in offsets.tolist()]
+        pieces = map(slice, bounds[:-1], bounds[1:])
+        if len(text) == len(data):  # ASCII만 있으면 바이트 오프셋이 곧 문자 위치이므로 문자열을 바로 자름
+            return list(map(text.__getitem__, pieces))
+        return [data[piece].decode('UTF-8') for piece in pieces]
+
+    def column_values(self, col, start=0, stop=None):
+        # 열의 [start, stop) 구간을 파이썬 값 목록으로 한 번에 디코딩
+        col = self.column_index(col)
+        stop = self.count if stop is None else min(stop, self.count)
+        if self.columns[col]['kind'] == KIND_FLOAT:
+            return self.column_slice(col, start, stop).tolist()
+        return self.string_column(col, start, stop)
+
+    def value(self, row, col):
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        column = self.columns[col]
+        if column['kind'] == KIND_FLOAT:
+            return self.item(col, row)
+        if column['encoding'] in CODE_TYPES:
+            return self.dictionary(col)[self.item(col, row)]
+        return bytes(self.read_bytes(col, 'aux', self.item(col, row), self.item(col, row + 1))).decode('UTF-8')
+
+    def row(self, row):
+        return [self.value(row, col) for col in range(len(self.columns))]
+
+    def find_rows(self, col, value):
+        # 문자열 열에서 값이 value인 행 번호 목록
+        # 사전 인코딩 열은 값을 코드 하나로 바꾼 뒤 코드 배열에서 그 바이트만 찾음 (문자열 비교 없음)
+        # 압축된 파일은 코드 섹션의 블록을 하나씩 풀어서 찾음 (다른 열은 풀지 않음)
+        col = self.column_index(col)
+        dictionary = self.dictionary(col)
+        if dictionary is None:
+            return [row for row, item in enumerate(self.string_column(col)) if item == value]
+        if value not in dictionary:
+            return []
+        typecode = CODE_TYPES[self.columns[col]['encoding']]
+        needle = to_little_endian(array(typecode, [dictionary.index(value)])).tobytes()
+        width = len(needle)
+        if self.compressed:
+            _, block_size, positions = self.block_table(col, 'data')
+            pieces = ((self.block(col, 'data', index), 0, index * block_size // width)
+                      for index in range(len(positions) - 1))
+        else:
+            pieces = [(self.mm, self.columns[col]['data_offset'], 0)]
+        rows = []
+        for buffer, start, first_row in pieces:
+            end = start + min(len(buffer) - start, width * (self.count - first_row))
+            position = buffer.find(needle, start, end)
+            while position != -1:
+                if (position - start) % width == 0:  # uint16 코드는 2바이트 경계에 맞는 위치만
+                    rows.append(first_row + (position - start) // width)
+                position = buffer.find(needle, position + 1, end)
+        return rows
+
+    def rows(self, start=0, stop=None):
+        for row in self.scan(start, stop):
+            yield list(row)
+
+    def scan(self, start=0, stop=None, chunk_rows=SCAN_CHUNK_ROWS):
+        # 전체 스캔용: chunk_rows행씩 열 단위로 한 번에 디코딩한 뒤 zip으로 행 튜플을 만듦
+        # 필드마다 value()를 부르지 않으므로 행 수가 많을수록 빠르고, 메모리는 청크 크기만큼만 씀
+        stop = self.count if stop is None else min(stop, self.count)
+        for low in range(start, stop, chunk_rows):
+            high = min(low + chunk_rows, stop)
+            yield from zip(*[self.column_values(col, low, high) for col in range(len(self.columns))])
+
+    def schema(self):
+        return [(column['name'], KIND_NAMES[column['kind']]) for column in self.columns]
+
+    def describe(self):
+        # 열 이름, 종류, 인코딩 (압축 방식은 self.flags)
+        return [(column['name'], KIND_NAMES[column['kind']], ENCODING_NAMES[column['encoding']])
+                for column in self.columns]
+
@@ -0,0 +1,127 @@
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from inventory_format import KIND_FLOAT, InventoryFile, to_float, to_little_endian
+
+# 인덱스 파일 구조
+#   헤더 : magic, 원본 파일 크기, 원본 수정 시각(ns), 항목 수, 키 열 이름 길이 + 이름
+#   키   : float64 배열 (오름차순)
+#   행   : uint64 배열 (키와 같은 순서의 이진 파일 행 번호)
+# 원본 크기/수정 시각이 다르면 인덱스가 오래된 것으로 보고 다시 만듦
+MAGIC = b'MINVIDX1'
+HEADER = struct.Struct('<8sQqQH6x')
+
+
+def index_path_for(inventory_path, column='Flammability'):
+    return f'{inventory_path}.{column.split()[0].lower()}.idx'
+
+
+def source_stamp(inventory_path):
+    stat = os.stat(inventory_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_index(index_path, column, pairs, stamp):
+    # pairs: (키, 행 번호) 목록, 키 순서로 정렬되어 있어야 함
+    keys = array('d', (key for key, _ in pairs))
+    rows = array('Q', (row for _, row in pairs))
+    encoded = column.encode('UTF-8')
+    temp_path = index_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, stamp[0], stamp[1], len(keys), len(encoded)))
+        f.write(encoded)
+        f.write(b'\0' * (-f.tell() % 8))
+        to_little_endian(keys).tofile(f)
+        to_little_endian(rows).tofile(f)
+    os.replace(temp_path, index_path)
+
+
+def build_index(inventory_path, column='Flammability', index_path=None):
+    # 이진 파일에서 키 열만 읽어 (키, 행 번호) 쌍을 정렬해서 저장 (NaN 키는 제외)
+    index_path = index_path or index_path_for(inventory_path, column)
+    with InventoryFile(inventory_path) as inventory:
+        col = inventory.column_index(column)
+        if inventory.columns[col]['kind'] == KIND_FLOAT:
+            keys = list(inventory.numeric_column(col))
+        else:
+            keys = [to_float(item) for item in inventory.string_column(col)]
+    pairs = sorted((key, row) for row, key in enumerate(keys) if key == key)  # key == key는 NaN 제외
+    write_index(index_path, column, pairs, source_stamp(inventory_path))
+    return index_path
+
+
+class SortedIndex:
+
+    def __init__(self, index_path):
+        self.file = open(index_path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, mtime_ns, self.count, name_len = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'인덱스 파일이 아님: {index_path}')
+        self.stamp = (size, mtime_ns)
+        position = HEADER.size
+        self.column = self.mm[position:position + name_len].decode('UTF-8')
+        position += name_len
+        position += -position % 8
+        # 파일 전체를 읽지 않고 매핑된 메모리를 배열로 캐스팅해서 bisect에 바로 사용
+        # 조회할 때는 이진 탐색으로 건드리는 몇 개 페이지만 실제로 읽힘
+        keys = memoryview(self.mm)[position:position + 8 * self.count]
+        rows = memoryview(self.mm)[position + 8 * self.count:position + 16 * self.count]
+        if sys.byteorder == 'little':
+            self.keys, self.rows = keys.cast('d'), rows.cast('Q')
+        else:  # 빅 엔디언 시스템에서는 한 번 뒤집어서 복사
+            self.keys, self.rows = array('d', keys.cast('d')), array('Q', rows.cast('Q'))
+            self.keys.byteswap()
+            self.rows.byteswap()
+        keys.release()
+        rows.release()
+
+    def close(self):
+        for view in (getattr(self, 'keys', None), getattr(self, 'rows', None)):
+            if isinstance(view, memoryview):
+                view.release()
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def range(self, low=None, high=None):
+        # low <= 키 <= high 인 항목의 위치 구간을 이진 탐색으로 찾음 (O(log n))
+        start = 0 if low is None else bisect.bisect_left(self.keys, low)
+        stop = self.count if high is None else bisect.bisect_right(self.keys, high)
+        return start, max(start, stop)
+
+
+def ensure_index(inventory_path, column='Flammability', index_path=None):
+    # 인덱스가 없거나 원본 이진 파일이 바뀌었으면 다시 만듦
+    index_path = index_path or index_path_for(inventory_path, column)
+    if os.path.exists(index_path):
+        with SortedIndex(index_path) as index:
+            if index.stamp == source_stamp(inventory_path) and index.column == column:
+                return index_path
+    return build_index(inventory_path, column, index_path)
+
+
+def query(inventory_path, low=None, high=None, column='Flammability', order='key'):
+    # low <= 키 <= high 인 행만 이진 파일에서 읽어서 돌려줌
+    #   order='key' : 키 오름차순, 'row' : 이진 파일의 행 순서
+    index_path = ensure_index(inventory_path, column)
+    with SortedIndex(index_path) as index:
+        start, stop = index.range(low, high)
+        rows = index.rows[start:stop].tolist()
+    if order == 'row':
+        rows.sort()
+    with InventoryFile(inventory_path) as inventory:
+        return [inventory.row(row) for row in rows]
@@ -0,0 +1,285 @@
+import heapq
+import os
+import re
+import threading
+
+from inventory_format import KIND_FLOAT, KIND_STRING, InventoryFile, InventoryWriter
+
+STORE_PATH = 'codyssey02/inventory_store'
+KEY_COLUMN = 'Substance'
+ROW_ID = '__row'  # 세그먼트에만 있는 행 번호 열 (처음 들어온 순서, 같은 물질이 여러 행이어도 구분됨)
+DELETED = '__deleted'  # 세그먼트에만 있는 삭제 표시(툼스톤) 열
+HIDDEN_COLUMNS = 2
+SEGMENT_NAME = re.compile(r'^seg_(\d{8})\.bin$')
+META_NAME = 'store.meta'  # '마지막으로 반영한 세그먼트 번호 다음 행 번호' 한 줄
+
+
+class SegmentStore:
+    # LSM 방식 인벤토리 저장소
+    #   - 추가/수정/삭제는 바뀐 행만 (키, 행 번호) 순서로 정렬해서 작은 세그먼트 파일로 씀 (O(변경 수))
+    #   - 같은 물질이 여러 행이면 행 번호로 구분해서 모두 보관 (원본 CSV의 중복 행을 버리지 않음)
+    #   - 읽을 때는 최신 세그먼트부터 찾고, 전체 조회는 세그먼트들을 키 순서로 병합
+    #   - 압축(compaction)은 모든 세그먼트를 하나로 합치면서 이전 값과 툼스톤을 정리
+
+    def __init__(self, path=STORE_PATH, header=None, key_column=KEY_COLUMN):
+        self.path = path
+        self.key_column = key_column
+        self.header = header
+        self.lock = threading.RLock()  # 세그먼트 목록을 바꾸거나 읽는 동안 잠금
+        self.compact_lock = threading.Lock()  # 압축은 한 번에 하나만
+        self.files = {}  # 세그먼트 번호 -> 열린 InventoryFile
+        self.compactor = None
+        self.stop_event = threading.Event()
+        self.next_row = 0  # 새로 추가되는 행에 줄 행 번호
+        os.makedirs(path, exist_ok=True)
+        segments = self.segments()
+        if segments:
+            with InventoryFile(self.segment_path(segments[-1])) as newest:
+                if newest.header[-HIDDEN_COLUMNS:] != [ROW_ID, DELETED]:
+                    raise ValueError(f'세그먼트 형식이 다름: {self.segment_path(segments[-1])}')
+                self.header = newest.header[:-HIDDEN_COLUMNS]  # 마지막 두 열은 행 번호, 툼스톤 열
+            # 다음 행 번호는 메타 파일에서 읽고, 메타 파일보다 새 세그먼트(기록 도중 종료된 경우)만 직접 확인
+            # 세그먼트 전체를 훑지 않으므로 여는 비용이 인벤토리 크기와 상관없음
+            meta_seq, self.next_row = self.read_meta()
+            for seq in segments:
+                if seq > meta_seq:
+                    row_ids = self.open_segment(seq).numeric_column(ROW_ID)
+                    if len(row_ids):
+                        self.next_row = max(self.next_row, int(max(row_ids)) + 1)
+
+    def segment_path(self, seq):
+        return os.path.join(self.path, f'seg_{seq:08d}.bin')
+
+    def read_meta(self):
+        try:
+            with open(os.path.join(self.path, META_NAME), 'r', encoding='UTF-8') as f:
+                seq, next_row = f.read().split()
+                return int(seq), int(next_row)
+        except (OSError, ValueError):
+            return 0, 0
+
+    def write_meta(self, seq):
+        # 세그먼트를 바꾼 뒤에 기록 (임시 파일에 쓰고 교체하므로 중간에 끊겨도 이전 값이 남음)
+        path = os.path.join(self.path, META_NAME)
+        with open(path + '.tmp', 'w', encoding='UTF-8') as f:
+            f.write(f'{seq} {self.next_row}\n')
+        os.replace(path + '.tmp', path)
+
+    def segments(self):
+        # 오래된 것부터 최신 순서의 세그먼트 번호 목록
+        result = []
+        for name in os.listdir(self.path):
+            match = SEGMENT_NAME.match(name)
+            if match:
+                result.append(int(match.group(1)))
+        return sorted(result)
+
+    def open_segment(self, seq):
+        inventory = self.files.get(seq)
+        if inventory is None:
+            inventory = self.files[seq] = InventoryFile(self.segment_path(seq))
+        return inventory
+
+    def close(self):
+        self.stop_compactor()
+        with self.lock:
+            for inventory in self.files.values():
+                inventory.close()
+            self.files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def schema(self):
+        # 모든 데이터 열은 문자열, 행 번호와 툼스톤 열만 숫자로 저장
+        return [(name, KIND_STRING) for name in self.header] + [(ROW_ID, KIND_FLOAT), (DELETED, KIND_FLOAT)]
+
+    def write_segment(self, path, records):
+        # records: (키, 행 번호) 순서로 정렬된 (행, 행 번호, 삭제 여부)
+        count = 0
+        with InventoryWriter(path, self.schema()) as writer:
+            for row, row_id, deleted in records:
+                writer.write_row(list(row) + [float(row_id), 1.0 if deleted else 0.0])
+                count += 1
+        return count
+
+    def apply(self, changes):
+        # changes: {(키, 행 번호): 행 또는 None(삭제)}, 한 번의 변경을 새 세그먼트 하나로 기록
+        if not changes:
+            return None
+        key_col = self.header.index(self.key_column)
+        records = []
+        for key, row_id in sorted(changes):
+            row = changes[(key, row_id)]
+            if row is None:  # 삭제는 키만 채운 툼스톤 행으로 기록
+                tombstone = [''] * len(self.header)
+                tombstone[key_col] = key
+                records.append((tombstone, row_id, True))
+            else:
+                records.append((row, row_id, False))
+        with self.lock:
+            segments = self.segments()
+            seq = segments[-1] + 1 if segments else 1
+            temp_path = self.segment_path(seq) + '.tmp'
+            self.write_segment(temp_path, records)
+            os.replace(temp_path, self.segment_path(seq))
+            self.write_meta(seq)
+        return seq
+
+    def put(self, rows, header=None):
+        # 추가 또는 수정
+        # 이미 있는 물질은 기존 행을 순서대로 바꾸고, 남는 행은 새 행 번호로 추가
+        # 한 번에 같은 물질이 여러 행 들어오면 합치지 않고 모두 보관하고 알려줌
+        if self.header is None:
+            self.header = header
+        key_col = self.header.index(self.key_column)
+        changes = {}
+        counts = {}
+        free_ids = {}  # 키 -> 아직 바꾸지 않은 기존 행 번호들
+        with self.lock:
+            for row in rows:  # 입력 순서대로 행 번호를 줘서 원본 순서를 유지
+                key = row[key_col]
+                if key not in free_ids:
+                    free_ids[key] = list(self.lookup(key))
+                if free_ids[key]:
+                    row_id = free_ids[key].pop(0)
+                else:
+                    row_id = self.next_row
+                    self.next_row += 1
+                changes[(key, row_id)] = row
+                counts[key] = counts.get(key, 0) + 1
+            for key, count in counts.items():
+                if count > 1:
+                    print(f'중복 물질 {key}: {count}행 (모두 보관)')
+            return self.apply(changes)
+
+    def delete(self, keys):
+        # 물질 이름으로 삭제 (같은 물질의 행은 모두 삭제)
+        changes = {}
+        with self.lock:
+            for key in keys:
+                row_ids = self.lookup(key)
+                if not row_ids:
+                    print(f'삭제할 물질이 없음: {key}')
+                for row_id in row_ids:
+                    changes[(key, row_id)] = None
+            return self.apply(changes)
+
+    def find(self, inventory, key):
+        # 세그먼트는 (키, 행 번호) 순서로 저장되어 있으므로 이진 탐색으로 키의 첫 행을 찾음 (O(log n))
+        # 같은 키의 행 번호 범위 [low, high)를 돌려줌
+        key_col = self.header.index(self.key_column)
+        low, high = 0, len(inventory)
+        while low < high:
+            middle = (low + high) // 2
+            if inventory.value(middle, key_col) < key:
+                low = middle + 1
+            else:
+                high = middle
+        high = low
+        while high < len(inventory) and inventory.value(high, key_col) == key:
+            high += 1
+        return low, high
+
+    def lookup(self, key):
+        # 키의 현재 행들 {행 번호: 값}, 최신 세그먼트부터 찾아서 행 번호마다 처음 나온 값이 현재 값
+        found = {}
+        with self.lock:
+            for seq in reversed(self.segments()):
+                inventory = self.open_segment(seq)
+                low, high = self.find(inventory, key)
+                for row in range(low, high):
+                    values = inventory.row(row)
+                    row_id = int(values[-2])
+                    if row_id not in found:
+                        found[row_id] = None if values[-1] else values[:-HIDDEN_COLUMNS]
+        return {row_id: found[row_id] for row_id in sorted(found) if found[row_id] is not None}
+
+    def get(self, key):
+        # 키의 현재 행 (같은 물질이 여러 행이면 먼저 들어온 행), 없거나 삭제됐으면 None
+        values = list(self.lookup(key).values())
+        return values[0] if values else None
+
+    def merged(self, segments, keep_deleted=False):
+        # segments: (세그먼트 번호, InventoryFile) 목록
+        # (키, 행 번호) 순서로 병합하고, 같은 행은 번호가 큰(최신) 세그먼트 값만 남김
+        key_col = self.header.index(self.key_column)
+
+        def records(seq, inventory):
+            for values in inventory.rows():
+                yield values[key_col], values[-2], -seq, values
+
+        last = None
+        for key, row_id, _, values in heapq.merge(*[records(seq, inventory) for seq, inventory in segments]):
+            if (key, row_id) == last:
+                continue  # 같은 행의 이전 버전
+            last = (key, row_id)
+            deleted = bool(values[-1])
+            if deleted and not keep_deleted:
+                continue
+            yield values[:-HIDDEN_COLUMNS], int(row_id), deleted
+
+    def scan(self):
+        # 현재 인벤토리 전체를 (키, 행 번호) 순서로 돌려줌 (끝까지 읽어야 잠금이 풀림)
+        with self.lock:
+            segments = [(seq, self.open_segment(seq)) for seq in self.segments()]
+            for row, _, _ in self.merged(segments):
+                yield row
+
+    def to_data(self):
+        # 행이 처음 들어온 순서(원본 CSV 순서)로 돌려줌, 새로 추가된 행은 뒤에 붙음
+        with self.lock:
+            segments = [(seq, self.open_segment(seq)) for seq in self.segments()]
+            records = sorted(self.merged(segments), key=lambda record: record[1])
+        return [list(self.header)] + [row for row, _, _ in records]
+
+    def compact(self):
+        # 현재 있는 세그먼트 전체를 하나로 병합, 병합 중에 새로 들어온 세그먼트는 그대로 둠
+        with self.compact_lock:
+            with self.lock:
+                segments = self.segments()
+            if len(segments) < 2:
+                return 0
+            newest = segments[-1]
+            temp_path = self.segment_path(newest) + '.compact'
+            # 병합은 잠금 없이 별도로 연 파일로 진행하므로 그동안 읽기/쓰기가 막히지 않음
+            # 가장 오래된 세그먼트까지 포함한 전체 병합이므로 툼스톤은 버려도 됨
+            inputs = [(seq, InventoryFile(self.segment_path(seq))) for seq in segments]
+            try:
+                count = self.write_segment(temp_path, self.merged(inputs))
+            finally:
+                for _, inventory in inputs:
+                    inventory.close()
+            with self.lock:
+                for seq in segments:
+                    inventory = self.files.pop(seq, None)
+                    if inventory is not None:
+                        inventory.close()
+                os.replace(temp_path, self.segment_path(newest))  # 합친 결과가 가장 최신 번호를 이어받음
+                for seq in segments[:-1]:
+                    os.remove(self.segment_path(seq))
+                self.write_meta(self.segments()[-1])
+            return count
+
+    def start_compactor(self, interval=30.0, min_segments=4):
+        # 세그먼트가 min_segments개 이상 쌓이면 백그라운드 스레드에서 압축
+        def run():
+            while not self.stop_event.wait(interval):
+                if len(self.segments()) >= min_segments:
+                    try:
+                        self.compact()
+                    except Exception as e:
+                        print('세그먼트 압축 오류:', e)
+
+        self.stop_event.clear()
+        self.compactor = threading.Thread(target=run, daemon=True)
+        self.compactor.start()
+
+    def stop_compactor(self):
+        if self.compactor is not None:
+            self.stop_event.set()
+            self.compactor.join()
+            self.compactor = None
@@ -0,0 +1,117 @@
+import re
+
+import numpy as np
+
+from inventory_format import KIND_FLOAT, format_value, to_float
+
+OPERATORS = {
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '<': np.less,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+PREDICATE = re.compile(r'^\s*(.+?)\s*(>=|<=|==|!=|>|<)\s*(\S+)\s*$')
+
+
+def parse_predicate(text):
+    # 'Specific Gravity<1' 같은 조건 문자열을 (열 이름, 연산자, 값)으로 바꿈
+    match = PREDICATE.match(text)
+    if not match:
+        raise ValueError(f'조건 형식이 잘못됨: {text} (예: "Specific Gravity<1")')
+    name, op, value = match.groups()
+    return name, op, float(value)
+
+
+class NumericTable:
+    # 숫자 열을 한 번만 float64 배열로 바꿔두고 정렬/필터는 배열 연산으로 처리
+    # 'Various'처럼 숫자가 아닌 칸은 NaN이 되며, NaN은 어떤 비교에서도 False
+
+    def __init__(self, header, rows, columns=None):
+        self.header = header
+        self.rows = rows
+        if columns is None:
+            columns = {}
+            for i, name in enumerate(header):
+                values = np.fromiter((to_float(row[i]) for row in rows), dtype=np.float64, count=len(rows))
+                if len(values) == 0 or not np.isnan(values).all():  # 숫자가 하나도 없는 열은 제외
+                    columns[name] = values
+        self.columns = columns
+
+    @classmethod
+    def from_inventory(cls, inventory):
+        # 이진 파일의 숫자 열은 복사 없이 배열로 감싸고, 문자열 열은 한 번만 변환
+        # 배열이 mmap을 직접 가리키므로 테이블을 다 쓴 뒤에 파일을 닫아야 함
+        columns = {}
+        for col, column in enumerate(inventory.columns):
+            if column['kind'] == KIND_FLOAT:
+                columns[column['name']] = np.frombuffer(inventory.numeric_column(col), dtype='<f8')
+            elif inventory.dictionary(col) is not None:
+                # 사전 인코딩 열은 사전 값만 변환하고 코드 배열로 한 번에 펼침
+                lookup = np.array([to_float(item) for item in inventory.dictionary(col)], dtype=np.float64)
+                codes = np.frombuffer(inventory.column_view(col), dtype=inventory.column_view(col).format)
+                values = lookup[codes]
+                if len(values) == 0 or not np.isnan(values).all():
+                    columns[column['name']] = values
+            else:
+                values = np.fromiter((to_float(item) for item in inventory.string_column(col)),
+                                     dtype=np.float64, count=len(inventory))
+                if len(values) == 0 or not np.isnan(values).all():
+                    columns[column['name']] = values
+        return cls(inventory.header, LazyRows(inventory), columns)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name):
+        return self.columns[name]
+
+    def argsort(self, name, descending=False):
+        # 안정 정렬, NaN은 오름차순/내림차순 모두 맨 뒤
+        values = self.columns[name]
+        return np.argsort(-values if descending else values, kind='stable')
+
+    def mask(self, name, op, value):
+        return OPERATORS[op](self.columns[name], value)
+
+    def where(self, predicates):
+        # predicates: [(열 이름, 연산자, 값), ...] 를 모두 만족하는 행 (AND)
+        result = np.ones(len(self.rows), dtype=bool)
+        for name, op, value in predicates:
+            result &= self.mask(name, op, value)
+        return result
+
+    def take(self, indices):
+        # 행 순서를 바꾸거나 일부만 고른 새 테이블 (배열은 인덱싱 한 번으로 재배치)
+        indices = np.asarray(indices)
+        rows = [self.rows[i] for i in indices.tolist()]
+        columns = {name: values[indices] for name, values in self.columns.items()}
+        return NumericTable(self.header, rows, columns)
+
+    def sort_by(self, name, descending=False):
+        return self.take(self.argsort(name, descending))
+
+    def filter(self, predicates):
+        return self.take(np.flatnonzero(self.where(predicates)))
+
+    def to_data(self):
+        # 기존 함수들이 쓰는 [헤더] + 행 목록 형태
+        return [self.header] + list(self.rows)
+
+
+class LazyRows:
+    # 이진 파일에서 만든 테이블의 행 목록, 실제로 필요한 행만 문자열로 만듦
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+
+    def __len__(self):
+        return len(self.inventory)
+
+    def __getitem__(self, row):
+        return [format_value(value) for value in self.inventory.row(row)]
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
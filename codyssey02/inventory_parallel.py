@@ -0,0 +1,138 @@
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from inventory_format import KIND_FLOAT, KIND_STRING, InventoryWriter, to_float
+from inventory_numeric import NumericTable
+
+RANGE_SIZE = 32 * 1024 * 1024  # 프로세스 하나가 한 번에 읽어서 파싱하는 최대 바이트 수
+
+
+def read_header(filename):
+    with open(filename, 'rb') as f:
+        line = f.readline()
+        return line.decode('UTF-8').rstrip('\r\n').split(','), f.tell()
+
+
+def split_ranges(filename, start, parts):
+    # [start, 파일 끝)을 parts개의 바이트 구간으로 나누되, 경계는 항상 다음 줄의 시작으로 맞춤
+    size = os.path.getsize(filename)
+    bounds = [start]
+    with open(filename, 'rb') as f:
+        for i in range(1, parts):
+            position = start + (size - start) * i // parts
+            if position <= bounds[-1]:
+                continue
+            f.seek(position - 1)
+            f.readline()  # 경계가 줄 중간이면 그 줄 끝까지 넘김
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def to_floats(values):
+    # 모두 숫자인 열은 map(float)로 한 번에 변환
+    # 숫자가 아닌 값이 섞인 열은 서로 다른 값만 한 번씩 변환해서 표로 찾음 ('Various'처럼 반복되는 값이 많음)
+    try:
+        return array('d', map(float, values)), True
+    except ValueError:
+        pass
+    table = {item: to_float(item) for item in set(values)}
+    return array('d', map(table.__getitem__, values)), False
+
+
+def parse_range(filename, start, stop, column_count):
+    # 구간 하나를 읽어서 열별 값으로 나눔
+    #   strings : 열마다 값을 줄바꿈으로 이은 문자열 (리스트를 그대로 넘기는 것보다 프로세스 간 전달이 훨씬 빠름)
+    #   floats  : 열마다 float64 배열 (숫자가 아니면 NaN)
+    #   numeric : 열마다 모든 값이 숫자인지 여부
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        text = f.read(stop - start).decode('UTF-8')
+    rows = [line.split(',') for line in text.splitlines() if line]
+    columns = list(zip(*rows)) if rows else [() for _ in range(column_count)]
+    strings = ['\n'.join(values) for values in columns]
+    floats = []
+    numeric = []
+    for values in columns:
+        column, is_numeric = to_floats(values)
+        floats.append(column)
+        numeric.append(is_numeric)
+    return strings, floats, numeric
+
+
+class ParsedInventory:
+    # 병렬로 읽은 CSV를 열 단위로 보관 (정렬은 to_table(), 이진 저장은 write())
+
+    def __init__(self, header, strings, floats, numeric):
+        self.header = header
+        self.strings = strings
+        self.floats = floats
+        self.numeric = numeric
+        self.count = len(strings[0]) if strings else 0
+
+    def __len__(self):
+        return self.count
+
+    def schema(self):
+        return [(name, KIND_FLOAT if self.numeric[i] else KIND_STRING) for i, name in enumerate(self.header)]
+
+    def rows(self):
+        return [list(row) for row in zip(*self.strings)]
+
+    def to_data(self):
+        # 기존 함수들이 쓰는 [헤더] + 행 목록 형태
+        return [self.header] + self.rows()
+
+    def to_table(self, rows=None):
+        # float 배열은 복사 없이 NumPy 배열로 감싸서 NumericTable에 넘김 (숫자가 하나도 없는 열은 제외)
+        columns = {}
+        for name, values in zip(self.header, self.floats):
+            values = np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+            if len(values) == 0 or not np.isnan(values).all():
+                columns[name] = values
+        return NumericTable(self.header, rows if rows is not None else self.rows(), columns)
+
+    def write(self, filename):
+        # 숫자 열은 이미 변환한 float 값을 그대로 씀
+        values = [self.floats[i] if self.numeric[i] else self.strings[i] for i in range(len(self.header))]
+        with InventoryWriter(filename, self.schema()) as writer:
+            for row in zip(*values):
+                writer.write_row(row)
+        return self.schema()
+
+
+def load_csv_parallel(filename, workers=None, range_size=RANGE_SIZE):
+    # 파일을 줄 경계에 맞춘 바이트 구간으로 나눠서 프로세스 풀에서 파싱 (파일 내용은 출력하지 않음)
+    # 구간 결과는 파일 순서대로 이어 붙이므로 행 순서는 원본과 같음
+    header, start = read_header(filename)
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(filename)
+    parts = max(workers, math.ceil((size - start) / range_size))
+    ranges = split_ranges(filename, start, parts)
+
+    if workers == 1 or len(ranges) == 1:
+        results = [parse_range(filename, low, high, len(header)) for low, high in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(parse_range, [filename] * len(ranges),
+                                        [low for low, _ in ranges], [high for _, high in ranges],
+                                        [len(header)] * len(ranges)))
+
+    strings = [[] for _ in header]
+    floats = [array('d') for _ in header]
+    numeric = [True] * len(header)
+    for part_strings, part_floats, part_numeric in results:
+        for i in range(len(header)):
+            if part_strings[i] or len(part_floats[i]):  # 빈 문자열 하나와 빈 구간을 구분
+                strings[i] += part_strings[i].split('\n')
+            floats[i] += part_floats[i]
+            numeric[i] = numeric[i] and part_numeric[i]
+    return ParsedInventory(header, strings, floats, numeric)
@@ -0,0 +1,100 @@
+import heapq
+import math
+import os
+import tempfile
+
+from inventory_format import KIND_FLOAT, KIND_STRING, InventoryWriter, is_number, to_float
+
+DEFAULT_MEMORY = 64 * 1024 * 1024  # 한 번에 메모리에 올려서 정렬할 최대 크기(바이트)
+ROW_OVERHEAD = 64  # 행 하나를 리스트로 만들 때 드는 대략적인 추가 메모리
+FIELD_OVERHEAD = 56  # 필드(str) 하나의 대략적인 추가 메모리
+MAX_FAN_IN = 64  # 한 번에 병합하는 런 파일 수 (열린 파일 수 제한)
+
+
+def iter_csv(filename):
+    # 파일 전체를 문자열로 읽지 않고 한 줄씩 나눠서 돌려줌 (첫 번째는 헤더)
+    with open(filename, 'r', encoding='UTF-8') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line.split(',')
+
+
+def make_key(col, descending):
+    # 숫자가 아닌 값(NaN)은 오름차순/내림차순 모두 맨 뒤로 보냄
+    def key(row):
+        value = to_float(row[col])
+        if math.isnan(value):
+            return (1, 0.0)
+        return (0, -value if descending else value)
+    return key
+
+
+def write_run(rows, temp_dir):
+    fd, path = tempfile.mkstemp(dir=temp_dir, suffix='.run')
+    with os.fdopen(fd, 'w', encoding='UTF-8') as f:
+        for row in rows:
+            f.write(','.join(row) + '\n')
+    return path
+
+
+def read_run(path):
+    with open(path, 'r', encoding='UTF-8') as f:
+        for line in f:
+            yield line.rstrip('\n').split(',')
+
+
+def merge_runs(paths, key, temp_dir):
+    # 런이 너무 많으면 MAX_FAN_IN개씩 먼저 병합해서 런 수를 줄임
+    while len(paths) > MAX_FAN_IN:
+        merged = []
+        for i in range(0, len(paths), MAX_FAN_IN):
+            group = paths[i:i + MAX_FAN_IN]
+            merged.append(write_run(heapq.merge(*[read_run(path) for path in group], key=key), temp_dir))
+            for path in group:
+                os.remove(path)
+        paths = merged
+    # heapq.merge는 같은 키면 앞 런을 먼저 내보내므로 전체 결과도 안정 정렬과 같음
+    return heapq.merge(*[read_run(path) for path in paths], key=key)
+
+
+def external_sort(csv_path, bin_path, column='Flammability', descending=True, memory_limit=DEFAULT_MEMORY):
+    # 메모리 한도만큼씩 읽어서 정렬한 런을 임시 파일로 내보내고,
+    # 런들을 힙으로 병합하면서 바로 이진 파일에 씀 (전체를 메모리에 올리지 않음)
+    rows = iter_csv(csv_path)
+    header = next(rows)
+    key = make_key(header.index(column), descending)
+    numeric = [True] * len(header)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(bin_path))) as temp_dir:
+        runs = []
+        buffer = []
+        used = 0
+        for row in rows:
+            for i, item in enumerate(row):  # 스키마는 런을 만드는 동안 같이 판단
+                if numeric[i] and not is_number(item):
+                    numeric[i] = False
+            buffer.append(row)
+            used += ROW_OVERHEAD + sum(FIELD_OVERHEAD + len(item) for item in row)
+            if used >= memory_limit:
+                buffer.sort(key=key)
+                runs.append(write_run(buffer, temp_dir))
+                buffer = []
+                used = 0
+
+        buffer.sort(key=key)
+        if runs:
+            if buffer:
+                runs.append(write_run(buffer, temp_dir))
+            buffer = []
+            merged = merge_runs(runs, key, temp_dir)
+        else:
+            merged = buffer  # 한 번에 메모리에 들어가면 임시 파일 없이 바로 씀
+
+        schema = [(name, KIND_FLOAT if numeric[i] else KIND_STRING) for i, name in enumerate(header)]
+        count = 0
+        with InventoryWriter(bin_path, schema) as writer:
+            for row in merged:
+                writer.write_row(row)
+                count += 1
+    return count, len(runs)
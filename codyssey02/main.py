@@ -1,4 +1,16 @@
-import struct
+import argparse
+import os
+
+from inventory_format import InventoryFile, format_value, write_inventory
+from inventory_index import query
+from inventory_lsm import STORE_PATH, SegmentStore
+from inventory_numeric import NumericTable, parse_predicate
+from inventory_parallel import load_csv_parallel
+from inventory_sort import external_sort
+
+FLAMMABILITY = 'Flammability'
+
+
 def read_csv_file(filename):
     try:
         with open(filename, 'r', encoding='UTF-8') as file:
@@ -13,53 +25,76 @@ def read_csv_file(filename):
         return []
 
 
-def sort_by_flammability(data):
+def sort_by_flammability(data, table=None):
+    # 숫자 열을 한 번만 배열로 바꾸고 argsort로 정렬 ('Various' 같은 값은 맨 뒤)
     try:
-        header = data[0]
-        body = data[1:]
-        body.sort(key=lambda x: float(x[4]), reverse=True)
-        return [header] + body
+        table = table or NumericTable(data[0], data[1:])
+        return table.sort_by(FLAMMABILITY, descending=True).to_data()
     except Exception as e:
         print('정렬 오류:', e)
         return data
 
 
-def save_true_binary_file(data, filename):
+def save_true_binary_file(data, filename, compression=None):
+    # 헤더(스키마, 행 수) + 고정 폭 숫자 열 + 오프셋 테이블이 있는 문자열 힙 형식으로 저장
+    # 반복되는 값이 많은 문자열 열('Various' 등)은 사전 + 정수 코드로 저장되고, compression을 주면 섹션을 압축
     try:
-        with open(filename, 'wb') as f:
-            for row in data[1:]:  # skip header
-                for item in row:
-                    try:
-                        value = float(item)
-                        f.write(struct.pack('f', value))  # 숫자: 4바이트 float
-                    except ValueError:
-                        encoded = item.encode('utf-8')
-                        length = len(encoded)
-                        f.write(struct.pack('H', length))  # 길이: 2바이트
-                        f.write(encoded)
-        print(f'이진 파일 저장 완료: {filename}')
+        write_inventory(filename, data[0], data[1:], compression=compression)  # data[0]은 헤더
+        print(f'이진 파일 저장 완료: {filename} ({os.path.getsize(filename)}바이트, 압축: {compression or "없음"})')
+        with InventoryFile(filename) as inventory:
+            for name, kind, encoding in inventory.describe():
+                print(f'  {name}: {kind} ({encoding})')
     except Exception as e:
         print('이진 파일 저장 오류:', e)
 
+
 def read_binary_file(filename):
     print('----인화성 정렬 이진파일 출력----')
     try:
-        with open(filename, 'rb') as f:
-            hex_data = f.read()
-            print(hex_data)
+        with InventoryFile(filename) as inventory:
+            print(f'행 수: {len(inventory)}, 열: {inventory.header}')
+            rows = [[format_value(value) for value in row] for row in inventory.rows()]
+            print_table(rows)
+            return [inventory.header] + rows
     except Exception as e:
         print('이진 파일 읽기 오류:', e)
+        return []
+
+
+def query_flammability(bin_filename, low=None, high=None):
+    # 정렬된 인덱스 파일에서 이진 탐색으로 시작 위치를 찾고 해당 행만 읽음
+    # 인덱스는 이진 파일이 바뀌면 자동으로 다시 만들어짐
+    rows = query(bin_filename, low, high, column=FLAMMABILITY, order='row')
+    return [[format_value(value) for value in row] for row in rows]
+
 
+def filter_by_value(bin_filename, column, value):
+    # 문자열 열이 value와 같은 행, 사전 인코딩 열은 문자열 대신 정수 코드로 비교
+    try:
+        with InventoryFile(bin_filename) as inventory:
+            rows = inventory.find_rows(column, value)
+            return [[format_value(item) for item in inventory.row(row)] for row in rows]
+    except Exception as e:
+        print('이진 파일 필터 오류:', e)
+        return []
 
-def filter_high_flammability(data, threshold=0.7):
-    high_list = []
-    for row in data[1:]:  # skip header
-        try:
-            if float(row[4]) >= threshold:
-                high_list.append(row)
-        except ValueError:
-            continue
-    return high_list
+
+def filter_rows(bin_filename, conditions):
+    # 여러 열 조건을 AND로 묶어서 거름, 예: ['Flammability>=0.7', 'Specific Gravity<1']
+    # 이진 파일의 숫자 열을 배열로 보고 불리언 마스크로 한 번에 거르며, 조건에 맞는 행만 문자열로 만듦
+    try:
+        predicates = [parse_predicate(condition) for condition in conditions]
+        with InventoryFile(bin_filename) as inventory:
+            table = NumericTable.from_inventory(inventory)
+            missing = [name for name, _, _ in predicates if name not in table.columns]
+            rows = [] if missing else list(table.filter(predicates).rows)
+            del table  # 파일을 닫기 전에 mmap을 가리키는 배열을 놓아줌
+        if missing:
+            print('숫자 열이 아님:', ', '.join(missing))
+        return rows
+    except Exception as e:
+        print('이진 파일 필터 오류:', e)
+        return []
 
 
 def save_to_csv(data, filename):
@@ -81,29 +116,112 @@ def print_table(data):
         print(f'{row[0]:<20} {row[1]:<10} {row[2]:<10} {row[3]:<15} {row[4]:<10}')
 
 
-def main():
-    base_path = 'codyssey02/'
+def sort_large_inventory(csv_filename, bin_filename, memory_mb):
+    # 메모리보다 큰 인벤토리: 메모리 한도만큼씩 정렬한 런을 임시 파일에 쓰고 병합해서 이진 파일로 저장
+    try:
+        count, runs = external_sort(csv_filename, bin_filename, FLAMMABILITY,
+                                    memory_limit=memory_mb * 1024 * 1024)
+        print(f'외부 정렬 완료: {count}행, 런 {runs}개 -> {bin_filename}')
+        return True
+    except Exception as e:
+        print('외부 정렬 오류:', e)
+        return False
+
+
+def load_from_store(csv_filename, restock=None, remove=(), compact=False):
+    # 세그먼트 저장소에서 현재 인벤토리를 읽음 (처음이면 CSV 전체를 첫 세그먼트로 저장)
+    # 입고/삭제는 바뀐 행만 새 세그먼트로 추가하므로 전체 이진 파일을 다시 쓰지 않음
+    try:
+        with SegmentStore(STORE_PATH) as store:
+            if not store.segments():
+                data = read_csv_file(csv_filename)
+                if not data:
+                    return []
+                store.put(data[1:], header=data[0])
+            if restock:
+                with open(restock, 'r', encoding='UTF-8') as file:
+                    lines = file.read().strip().split('\n')
+                store.put([line.split(',') for line in lines[1:]])  # 첫 줄은 헤더
+            if remove:
+                store.delete(remove)
+            if compact:
+                print(f'세그먼트 압축 완료: {store.compact()}행')
+            print(f'세그먼트 저장소: {STORE_PATH} (세그먼트 {len(store.segments())}개)')
+            return store.to_data()
+    except Exception as e:
+        print('세그먼트 저장소 오류:', e)
+        return []
 
-    csv_filename = base_path + 'Mars_Base_Inventory_List.csv'
-    bin_filename = base_path + 'Mars_Base_Inventory_List.bin'
-    danger_csv_filename = base_path + 'Mars_Base_Inventory_danger.csv'
 
-    # 1. CSV 읽기
-    data = read_csv_file(csv_filename)
-    if not data:
-        return
+def load_csv_columns(csv_filename, workers=None):
+    # 여러 프로세스로 CSV를 나눠 파싱 (파일 내용을 출력하지 않고 열 배열을 바로 만듦)
+    try:
+        parsed = load_csv_parallel(csv_filename, workers)
+        print(f'병렬 CSV 읽기 완료: {len(parsed)}행')
+        return parsed
+    except Exception as e:
+        print('CSV 파일 읽기 오류:', e)
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 기지 인벤토리 정렬/필터')
+    parser.add_argument('--csv', default='codyssey02/Mars_Base_Inventory_List.csv', help='인벤토리 CSV 경로')
+    parser.add_argument('--external-sort', action='store_true', help='메모리보다 큰 CSV를 외부 병합 정렬로 처리')
+    parser.add_argument('--memory-mb', type=int, default=64, help='--external-sort 에서 한 번에 정렬할 메모리 한도(MB)')
+    parser.add_argument('--compress', choices=['zlib', 'lzma'], help='이진 파일의 섹션을 압축해서 저장')
+    parser.add_argument('--strength', help='이진 파일에서 Strength 값이 같은 행만 출력 (예: Low)')
+    parser.add_argument('--parallel', action='store_true', help='CSV를 여러 프로세스로 나눠 파싱 (내용 출력 없음)')
+    parser.add_argument('--workers', type=int, help='--parallel 에서 사용할 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--where', action='append', default=[], metavar='CONDITION',
+                        help='정렬된 이진 파일에서 조건에 맞는 행만 출력, 여러 번 지정하면 AND (예: "Specific Gravity<1")')
+    parser.add_argument('--store', action='store_true', help='CSV 대신 세그먼트 저장소에서 인벤토리를 읽음')
+    parser.add_argument('--restock', help='추가/수정할 행이 담긴 CSV를 세그먼트 저장소에 반영 (--store 포함)')
+    parser.add_argument('--remove', action='append', default=[], metavar='SUBSTANCE',
+                        help='세그먼트 저장소에서 삭제할 물질 이름, 여러 번 지정 가능 (--store 포함)')
+    parser.add_argument('--compact', action='store_true', help='세그먼트 저장소를 하나의 세그먼트로 압축 (--store 포함)')
+    return parser.parse_args()
 
-    # 2. 인화성 기준 정렬
-    sorted_data = sort_by_flammability(data)
 
-    # 3. 정렬된 데이터를 이진 파일로 저장
-    save_true_binary_file(sorted_data, bin_filename)
+def main():
+    args = parse_args()
+    base_path = 'codyssey02/'
 
-    # 4. 이진 파일 내용 출력
-    read_binary_file(bin_filename)
+    csv_filename = args.csv
+    bin_filename = base_path + 'Mars_Base_Inventory_List.bin'
+    danger_csv_filename = base_path + 'Mars_Base_Inventory_danger.csv'
 
-    # 5. 인화성 0.7 이상 필터링
-    danger_items = filter_high_flammability(sorted_data)
+    if args.external_sort:
+        # 1~3. CSV를 스트리밍으로 읽어 외부 정렬 후 이진 파일로 저장 (전체를 메모리에 올리지 않음)
+        if not sort_large_inventory(csv_filename, bin_filename, args.memory_mb):
+            return
+    else:
+        # 1. CSV 또는 세그먼트 저장소 읽기
+        table = None
+        if args.store or args.restock or args.remove or args.compact:
+            data = load_from_store(csv_filename, args.restock, args.remove, args.compact)
+        elif args.parallel:
+            parsed = load_csv_columns(csv_filename, args.workers)
+            if parsed is None:
+                return
+            data = parsed.to_data()
+            table = parsed.to_table(data[1:])  # 숫자 열은 파싱할 때 만든 배열을 그대로 사용
+        else:
+            data = read_csv_file(csv_filename)
+        if not data:
+            return
+
+        # 2. 인화성 기준 정렬 (숫자 열은 여기서 한 번만 배열로 변환)
+        sorted_data = sort_by_flammability(data, table)
+
+        # 3. 정렬된 데이터를 이진 파일로 저장
+        save_true_binary_file(sorted_data, bin_filename, args.compress)
+
+        # 4. 이진 파일 내용 출력
+        read_binary_file(bin_filename)
+
+    # 5. 인화성 0.7 이상 필터링 (인덱스로 이진 탐색)
+    danger_items = query_flammability(bin_filename, low=0.7)
 
     print('\n----인화성 0.7 이상----')
     print_table(danger_items)
@@ -111,6 +229,14 @@ def main():
     # 6. 필터링된 데이터 CSV 저장
     save_to_csv(danger_items, danger_csv_filename)
 
+    if args.strength:
+        print(f'\n----Strength = {args.strength}----')
+        print_table(filter_by_value(bin_filename, 'Strength', args.strength))
+
+    if args.where:
+        print(f'\n----{" AND ".join(args.where)}----')
+        print_table(filter_rows(bin_filename, args.where))
+
 
 if __name__ == '__main__':
     main()
@@ -1,6 +1,8 @@
 import time        
 import threading    
 import random       
+import math
+from array import array
 
 class DummySensor:
 
@@ -38,13 +40,87 @@ def dict_to_json_like_string(d):
     json_like += "}"
     return json_like
 
+class StreamingStats:
+    # 센서 값마다 리스트에 쌓지 않고 (개수, 평균, M2, 최소, 최대)만 갱신 (Welford 방식, 샘플당 O(1))
+    # 끝난 구간의 통계는 고정 크기 링 버퍼(array)에 보관해서 메모리 사용량이 일정함
+    FIELDS = 5
+    STATS = ("mean", "stddev", "min", "max")
+
+    def __init__(self, keys, history=12):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.state = array("d", [0.0] * (self.FIELDS * len(self.keys)))
+        self.history_size = history
+        self.history = array("d", [0.0] * (history * len(self.keys) * len(self.STATS)))
+        self.history_next = 0
+        self.history_count = 0
+
+    def add(self, key, value):
+        base = self.FIELDS * self.index[key]
+        state = self.state
+        count = state[base] + 1
+        delta = value - state[base + 1]
+        mean = state[base + 1] + delta / count
+        state[base] = count
+        state[base + 1] = mean
+        state[base + 2] += delta * (value - mean)
+        if count == 1 or value < state[base + 3]:
+            state[base + 3] = value
+        if count == 1 or value > state[base + 4]:
+            state[base + 4] = value
+
+    def add_all(self, values):
+        for key, value in values.items():
+            self.add(key, value)
+
+    def count(self):
+        return int(self.state[0]) if self.keys else 0
+
+    def summary(self):
+        # {통계 이름: {센서 이름: 값}}, 표준편차는 표본 표준편차
+        result = {stat: {} for stat in self.STATS}
+        for key, i in self.index.items():
+            count, mean, m2, low, high = self.state[self.FIELDS * i:self.FIELDS * (i + 1)]
+            result["mean"][key] = mean
+            result["stddev"][key] = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+            result["min"][key] = low
+            result["max"][key] = high
+        return result
+
+    def close_window(self):
+        # 현재 구간의 통계를 링 버퍼에 넣고 다음 구간을 위해 초기화
+        summary = self.summary()
+        width = len(self.keys) * len(self.STATS)
+        base = self.history_next * width
+        for s, stat in enumerate(self.STATS):
+            for key, i in self.index.items():
+                self.history[base + s * len(self.keys) + i] = summary[stat][key]
+        self.history_next = (self.history_next + 1) % self.history_size
+        self.history_count = min(self.history_count + 1, self.history_size)
+        for i in range(len(self.state)):
+            self.state[i] = 0.0
+        return summary
+
+    def recent_windows(self):
+        # 링 버퍼에 남아있는 구간 통계 (오래된 것부터)
+        width = len(self.keys) * len(self.STATS)
+        windows = []
+        for n in range(self.history_count):
+            slot = (self.history_next - self.history_count + n) % self.history_size
+            base = slot * width
+            windows.append({
+                stat: {key: self.history[base + s * len(self.keys) + i] for key, i in self.index.items()}
+                for s, stat in enumerate(self.STATS)
+            })
+        return windows
+
 class MissionComputer:
 
     def __init__(self):
         self.ds = DummySensor()
         self.env_values = {}
         self.running = True
-        self.accumulated_data = {key: [] for key in self.ds.env_values.keys()}
+        self.stats = StreamingStats(self.ds.env_values.keys())
 
     def get_sensor_data(self):
         last_five_minute = time.time()
@@ -53,8 +129,7 @@ class MissionComputer:
                 self.ds.set_env()
                 self.env_values = self.ds.get_env()
 
-                for key, value in self.env_values.items():
-                    self.accumulated_data[key].append(value)
+                self.stats.add_all(self.env_values)
 
                 print(dict_to_json_like_string(self.env_values))
                 print("-" * 30)
@@ -62,14 +137,13 @@ class MissionComputer:
                 time.sleep(5)
 
                 if time.time() - last_five_minute >= 300:
+                    summary = self.stats.close_window()
                     print("=== 5분 평균 환경 데이터 ===")
-                    avg_data = {
-                        key: sum(values) / len(values)
-                        for key, values in self.accumulated_data.items()
-                    }
-                    print(dict_to_json_like_string(avg_data))
+                    print(dict_to_json_like_string(summary["mean"]))
+                    for stat, title in (("stddev", "표준편차"), ("min", "최소"), ("max", "최대")):
+                        print(f"--- 5분 {title} ---")
+                        print(dict_to_json_like_string(summary[stat]))
                     print("=" * 30)
-                    self.accumulated_data = {key: [] for key in self.env_values.keys()}
                     last_five_minute = time.time()
 
         except KeyboardInterrupt:
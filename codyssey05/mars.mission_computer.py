@@ -1,33 +1,73 @@
 import time
 import threading
+import asyncio
+import sys
 import random
 import platform #cpu와 운영체제의 기본정보를 가져오기 위해 사용 
 import psutil #사용량을 실시간으로 체크하기 위해 외부 라이브러리를 사용
 import os
+import math
+from array import array
+
+import numpy as np #센서 값을 배치로 생성하기 위해 사용
+
+# 센서별 값 범위 (최소, 최대)
+SENSOR_RANGES = {
+    "mars_base_internal_temperature": (18, 30),
+    "mars_base_external_temperature": (0, 21),
+    "mars_base_internal_humidity": (50, 60),
+    "mars_base_external_illuminance": (500, 715),
+    "mars_base_internal_co2": (0.02, 0.1),
+    "mars_base_internal_oxygen": (4, 7),
+}
+
 
 class DummySensor:
 
-    def __init__(self):
-        self.env_values = {
-            "mars_base_internal_temperature": None,
-            "mars_base_external_temperature": None,
-            "mars_base_internal_humidity": None,
-            "mars_base_external_illuminance": None,
-            "mars_base_internal_co2": None,
-            "mars_base_internal_oxygen": None
-        }
+    def __init__(self, seed=None, ranges=None):
+        self.ranges = dict(SENSOR_RANGES)
+        if ranges:
+            self.ranges.update(ranges)
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)  # 배치 생성용
+        self.env_values = {key: None for key in self.ranges}
 
     def set_env(self):
-        self.env_values["mars_base_internal_temperature"] = random.uniform(18, 30)
-        self.env_values["mars_base_external_temperature"] = random.uniform(0, 21)
-        self.env_values["mars_base_internal_humidity"] = random.uniform(50, 60)
-        self.env_values["mars_base_external_illuminance"] = random.uniform(500, 715)
-        self.env_values["mars_base_internal_co2"] = random.uniform(0.02, 0.1)
-        self.env_values["mars_base_internal_oxygen"] = random.uniform(4, 7)
+        for key, (low, high) in self.ranges.items():
+            self.env_values[key] = self.random.uniform(low, high)
 
     def get_env(self):
         return self.env_values
 
+    def generate_batch(self, n, model="uniform", drift=None, noise=None, walk_step=0.01, seed=None):
+        # n개 샘플을 센서마다 float64 배열로 한 번에 생성 ({센서 이름: 배열})
+        #   model="uniform" : set_env와 같은 분포 (구간 안에서 독립적인 균등 분포)
+        #   model="walk"    : 구간 가운데에서 시작하는 랜덤 워크, 한 걸음 표준편차 = walk_step * 구간 폭,
+        #                     구간 경계에서는 반사되어 안으로 돌아옴
+        #   drift : {센서 이름: 샘플당 증가량}, 센서 보정이 조금씩 틀어지는 상황 (구간을 벗어날 수 있음)
+        #   noise : {센서 이름: 표준편차}, 측정 잡음 (정규 분포)
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        drift = drift or {}
+        noise = noise or {}
+        steps = np.arange(n, dtype=np.float64)
+        batch = {}
+        for key, (low, high) in self.ranges.items():
+            if model == "uniform":
+                values = rng.uniform(low, high, n)
+            elif model == "walk":
+                width = high - low
+                values = np.cumsum(rng.normal(0.0, walk_step * width, n)) + width / 2
+                values %= 2 * width
+                values = np.where(values > width, 2 * width - values, values) + low
+            else:
+                raise ValueError(f"알 수 없는 센서 모델: {model}")
+            if drift.get(key):
+                values += drift[key] * steps
+            if noise.get(key):
+                values += rng.normal(0.0, noise[key], n)
+            batch[key] = values
+        return batch
+
 
 def dict_to_json_like_string(d):
     json_like = "{\n"
@@ -43,13 +83,263 @@ def dict_to_json_like_string(d):
     return json_like
 
 
+class StreamingStats:
+    # 센서 값마다 리스트에 쌓지 않고 (개수, 평균, M2, 최소, 최대)만 갱신 (Welford 방식, 샘플당 O(1))
+    # 끝난 구간의 통계는 고정 크기 링 버퍼(array)에 보관해서 메모리 사용량이 일정함
+    FIELDS = 5
+    STATS = ("mean", "stddev", "min", "max")
+
+    def __init__(self, keys, history=12):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.state = array("d", [0.0] * (self.FIELDS * len(self.keys)))
+        self.history_size = history
+        self.history = array("d", [0.0] * (history * len(self.keys) * len(self.STATS)))
+        self.history_next = 0
+        self.history_count = 0
+
+    def add(self, key, value):
+        base = self.FIELDS * self.index[key]
+        state = self.state
+        count = state[base] + 1
+        delta = value - state[base + 1]
+        mean = state[base + 1] + delta / count
+        state[base] = count
+        state[base + 1] = mean
+        state[base + 2] += delta * (value - mean)
+        if count == 1 or value < state[base + 3]:
+            state[base + 3] = value
+        if count == 1 or value > state[base + 4]:
+            state[base + 4] = value
+
+    def add_all(self, values):
+        for key, value in values.items():
+            self.add(key, value)
+
+    def count(self):
+        return int(self.state[0]) if self.keys else 0
+
+    def merge_state(self, other):
+        # 다른 구간의 (개수, 평균, M2, 최소, 최대)를 합침 (Chan 병렬 분산 공식, 원본 샘플 없이 O(센서 수))
+        state = self.state
+        for base in range(0, len(state), self.FIELDS):
+            count_b = other[base]
+            if count_b == 0:
+                continue
+            count_a = state[base]
+            if count_a == 0:
+                state[base:base + self.FIELDS] = other[base:base + self.FIELDS]
+                continue
+            count = count_a + count_b
+            delta = other[base + 1] - state[base + 1]
+            state[base + 1] += delta * count_b / count
+            state[base + 2] += other[base + 2] + delta * delta * count_a * count_b / count
+            state[base] = count
+            state[base + 3] = min(state[base + 3], other[base + 3])
+            state[base + 4] = max(state[base + 4], other[base + 4])
+
+    def summary(self):
+        # {통계 이름: {센서 이름: 값}}, 표준편차는 표본 표준편차
+        result = {stat: {} for stat in self.STATS}
+        for key, i in self.index.items():
+            count, mean, m2, low, high = self.state[self.FIELDS * i:self.FIELDS * (i + 1)]
+            result["mean"][key] = mean
+            result["stddev"][key] = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+            result["min"][key] = low
+            result["max"][key] = high
+        return result
+
+    def close_window(self):
+        # 현재 구간의 통계를 링 버퍼에 넣고 다음 구간을 위해 초기화
+        summary = self.summary()
+        width = len(self.keys) * len(self.STATS)
+        base = self.history_next * width
+        for s, stat in enumerate(self.STATS):
+            for key, i in self.index.items():
+                self.history[base + s * len(self.keys) + i] = summary[stat][key]
+        self.history_next = (self.history_next + 1) % self.history_size
+        self.history_count = min(self.history_count + 1, self.history_size)
+        for i in range(len(self.state)):
+            self.state[i] = 0.0
+        return summary
+
+    def recent_windows(self):
+        # 링 버퍼에 남아있는 구간 통계 (오래된 것부터)
+        width = len(self.keys) * len(self.STATS)
+        windows = []
+        for n in range(self.history_count):
+            slot = (self.history_next - self.history_count + n) % self.history_size
+            base = slot * width
+            windows.append({
+                stat: {key: self.history[base + s * len(self.keys) + i] for key, i in self.index.items()}
+                for s, stat in enumerate(self.STATS)
+            })
+        return windows
+
+
+# (이름, 구간 길이(초), 보관할 구간 수)
+ROLLUP_LEVELS = (
+    ("1m", 60, 180),
+    ("5m", 300, 288),
+    ("1h", 3600, 168),
+    ("1d", 86400, 365),
+)
+
+
+class RollupStats:
+    # 원본 샘플은 1분 구간에만 더하고, 1분 구간이 끝나면 5분 구간에 합치는 식으로 1시간, 1일까지 올려보냄
+    # 구간 경계는 시각을 구간 길이로 나눠 맞추므로 작은 구간은 항상 큰 구간 하나에 완전히 들어감
+    # 모든 단위의 지난 구간이 링 버퍼에 남아있어서 원본 샘플을 다시 읽지 않고 조회 가능
+
+    def __init__(self, keys, levels=ROLLUP_LEVELS):
+        self.keys = list(keys)
+        self.levels = []
+        for name, seconds, history in levels:
+            self.levels.append({
+                "name": name,
+                "seconds": seconds,
+                "stats": StreamingStats(self.keys, history),
+                "start": None,
+                "starts": array("d", [0.0] * history),  # 링 버퍼의 각 구간 시작 시각
+            })
+        self.names = [level["name"] for level in self.levels]
+
+    def advance(self, now):
+        # now가 현재 구간을 벗어난 단위는 구간을 닫고 윗단위에 합침, 닫힌 (이름, 시작 시각, 통계) 목록을 돌려줌
+        closed = []
+        for i, level in enumerate(self.levels):
+            start = now - now % level["seconds"]
+            if level["start"] is None:
+                level["start"] = start
+            if start <= level["start"]:  # 조금 늦게 도착한 샘플은 현재 구간에 넣음
+                continue
+            stats = level["stats"]
+            if stats.count():
+                if i + 1 < len(self.levels):
+                    self.levels[i + 1]["stats"].merge_state(stats.state)
+                level["starts"][stats.history_next] = level["start"]
+                closed.append((level["name"], level["start"], stats.close_window()))
+            level["start"] = start
+        return closed
+
+    def add(self, values, now=None):
+        now = time.time() if now is None else now
+        closed = self.advance(now)
+        self.levels[0]["stats"].add_all(values)
+        return closed
+
+    def add_state(self, state, now):
+        # 이미 집계된 (개수, 평균, M2, 최소, 최대)를 1분 구간에 합침 (배치 백필용)
+        closed = self.advance(now)
+        self.levels[0]["stats"].merge_state(state)
+        return closed
+
+    def current(self, name):
+        # 진행 중인 구간의 통계: 이 단위에 이미 합쳐진 값 + 아직 올라오지 않은 아래 단위 구간들
+        i = self.names.index(name)
+        merged = StreamingStats(self.keys, history=1)
+        for level in self.levels[:i + 1]:
+            merged.merge_state(level["stats"].state)
+        return self.levels[i]["start"], merged
+
+    def windows(self, name, include_current=True):
+        # (시작 시각, 통계) 목록, 오래된 것부터
+        level = self.levels[self.names.index(name)]
+        stats = level["stats"]
+        result = []
+        for n, summary in enumerate(stats.recent_windows()):
+            slot = (stats.history_next - stats.history_count + n) % stats.history_size
+            result.append((level["starts"][slot], summary))
+        if include_current:
+            start, merged = self.current(name)
+            if merged.count():
+                result.append((start, merged.summary()))
+        return result
+
+
+class PeriodicScheduler:
+    # 작업 시간과 상관없이 start + k * interval 의 절대 시각(monotonic)에 맞춰 깨어나는 주기 실행기
+    # time.sleep(interval)처럼 작업 시간만큼 주기가 늘어나거나 오차가 쌓이지 않음
+    # 너무 밀려서 한 주기 이상 놓치면 놓친 틱을 건너뛰고(skip_missed=True) missed로 표시
+    # 늦게 깨어난 정도(lateness)와 주기 흔들림(jitter = 실제 간격 - interval)은 StreamingStats로 집계
+
+    def __init__(self, interval, start=None, skip_missed=True):
+        self.interval = interval
+        self.skip_missed = skip_missed
+        self.origin = time.monotonic() if start is None else start
+        self.wall_origin = time.time() - (time.monotonic() - self.origin)  # 틱 시각을 벽시계로 바꿀 때 사용
+        self.ticks = 0  # 다음 틱 번호
+        self.missed = 0
+        self.last_wake = None
+        self.stats = StreamingStats(["lateness", "jitter"])
+
+    def deadline(self):
+        return self.origin + self.ticks * self.interval
+
+    def wall_time(self, tick):
+        # 틱의 예정 시각(벽시계), 실제로 늦게 깨어나도 샘플 시각이 밀리지 않음
+        return self.wall_origin + tick * self.interval
+
+    def delay(self):
+        return max(0.0, self.deadline() - time.monotonic())
+
+    def mark(self):
+        # 깨어난 뒤 호출: 늦은 정도를 기록하고 다음 틱으로 넘어감, (틱 번호, 예정 시각, 늦은 시간, 놓친 틱 수)
+        now = time.monotonic()
+        lateness = now - self.deadline()
+        missed = 0
+        if lateness >= self.interval:
+            missed = int(lateness // self.interval)
+            self.missed += missed
+            if self.skip_missed:  # 놓친 틱은 실행하지 않고 가장 최근 틱에 맞춤
+                self.ticks += missed
+                lateness = now - self.deadline()
+        self.stats.add("lateness", lateness)
+        if self.last_wake is not None:
+            self.stats.add("jitter", now - self.last_wake - self.interval)
+        self.last_wake = now
+        tick = self.ticks
+        self.ticks += 1
+        return tick, self.wall_time(tick), lateness, missed
+
+    def wait(self):
+        time.sleep(self.delay())
+        return self.mark()
+
+    async def wait_async(self):
+        await asyncio.sleep(self.delay())
+        return self.mark()
+
+    def report(self):
+        summary = self.stats.summary()
+        return {
+            "ticks": self.ticks,
+            "missed_ticks": self.missed,
+            "lateness_mean_ms": summary["mean"]["lateness"] * 1000,
+            "lateness_max_ms": summary["max"]["lateness"] * 1000,
+            "jitter_stddev_ms": summary["stddev"]["jitter"] * 1000,
+            "jitter_min_ms": summary["min"]["jitter"] * 1000,
+            "jitter_max_ms": summary["max"]["jitter"] * 1000,
+        }
+
+
+def print_summary(title, summary):
+    print(f"=== {title} 평균 환경 데이터 ===")
+    print(dict_to_json_like_string(summary["mean"]))
+    for stat, name in (("stddev", "표준편차"), ("min", "최소"), ("max", "최대")):
+        print(f"--- {title} {name} ---")
+        print(dict_to_json_like_string(summary[stat]))
+    print("=" * 30)
+
+
 class MissionComputer:
 
     def __init__(self):
         self.ds = DummySensor()
         self.env_values = {}
         self.running = True
-        self.accumulated_data = {key: [] for key in self.ds.env_values.keys()}
+        self.rollups = RollupStats(self.ds.env_values.keys())
+        self.scheduler = None
         self.setting = self.load_settings()
 
     def load_settings(self): #초기값을 false로 설정
@@ -101,36 +391,158 @@ class MissionComputer:
 
         return default
 
-    def get_sensor_data(self):
-        last_five_minute = time.time()
+    def get_sensor_data(self, interval=5):
+        # 5초 간격의 절대 시각에 맞춰 측정, 샘플 시각도 예정된 틱 시각을 사용해서 하루가 지나도 밀리지 않음
+        self.scheduler = PeriodicScheduler(interval)
         try:
             while self.running:
+                tick, now, lateness, missed = self.scheduler.wait()
+                if missed:
+                    print(f"[WARN] 처리가 밀려서 틱 {missed}개를 건너뜀 (늦은 시간 {lateness:.3f}s)")
+
                 self.ds.set_env()
                 self.env_values = self.ds.get_env()
 
-                for key, value in self.env_values.items():
-                    self.accumulated_data[key].append(value)
+                # 1분 구간에 더하고, 끝난 구간은 5분/1시간/1일 구간으로 합쳐짐
+                closed = self.rollups.add(self.env_values, now)
 
                 print(dict_to_json_like_string(self.env_values))
                 print("-" * 30)
 
-                time.sleep(5)
-
-                if time.time() - last_five_minute >= 300:
-                    print("=== 5분 평균 환경 데이터 ===")
-                    avg_data = {
-                        key: sum(values) / len(values)
-                        for key, values in self.accumulated_data.items()
-                    }
-                    print(dict_to_json_like_string(avg_data))
-                    print("=" * 30)
-                    self.accumulated_data = {key: [] for key in self.env_values.keys()}
-                    last_five_minute = time.time()
+                for name, start, summary in closed:
+                    if name != "1m":  # 1분 구간은 요청할 때만 출력
+                        print_summary(f"{name} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(start))})", summary)
+                    if name == "5m":
+                        self.get_timing()
 
         except KeyboardInterrupt:
             self.running = False
             print("System stopped...")
 
+    def get_timing(self):
+        # 주기 실행 상태: 틱 수, 놓친 틱 수, 늦은 시간과 주기 흔들림(ms)
+        if self.scheduler is None:
+            return
+        print("=== Sampling Timing ===")
+        print(dict_to_json_like_string(self.scheduler.report()))
+        print("=" * 30)
+
+    def backfill(self, n, start, interval=5.0, **options):
+        # 배치로 만든 n개 샘플(start부터 interval초 간격)을 롤업에 넣음
+        # 샘플을 1분 구간별로 NumPy로 집계한 뒤 구간마다 한 번씩만 합치므로 파이썬 반복은 구간 수만큼
+        batch = self.ds.generate_batch(n, **options)
+        times = start + interval * np.arange(n)
+        seconds = self.rollups.levels[0]["seconds"]
+        buckets = np.floor(times / seconds)
+        firsts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[firsts, n])
+        fields = StreamingStats.FIELDS
+        states = np.zeros((len(firsts), fields * len(self.rollups.keys)))
+        for i, key in enumerate(self.rollups.keys):
+            values = batch[key]
+            means = np.add.reduceat(values, firsts) / counts
+            states[:, fields * i] = counts
+            states[:, fields * i + 1] = means
+            states[:, fields * i + 2] = np.add.reduceat((values - np.repeat(means, counts)) ** 2, firsts)
+            states[:, fields * i + 3] = np.minimum.reduceat(values, firsts)
+            states[:, fields * i + 4] = np.maximum.reduceat(values, firsts)
+        closed = []
+        for first, state in zip(firsts.tolist(), states):
+            closed += self.rollups.add_state(array("d", state.tolist()), times[first])
+        return closed
+
+    async def sensor_task(self, sensor_id, sensor, interval, queue):
+        # 센서 하나를 자기 주기로 읽어서 공용 큐에 넣음, 시작 시점은 주기 안에서 흩어서 한꺼번에 몰리지 않게 함
+        scheduler = PeriodicScheduler(interval, time.monotonic() + sensor.random.uniform(0, interval))
+        self.schedulers[sensor_id] = scheduler
+        while True:
+            tick, now, lateness, missed = await scheduler.wait_async()
+            sensor.set_env()
+            await queue.put((sensor_id, now, dict(sensor.get_env())))
+
+    async def aggregate(self, queue):
+        # 모든 센서 값이 모이는 집계 단계: 전체 롤업에 더하고 센서별로는 마지막 값과 개수만 보관
+        while True:
+            sensor_id, now, values = await queue.get()
+            self.latest[sensor_id] = (now, values)
+            self.readings += 1
+            for name, start, summary in self.rollups.add(values, now):
+                if name != "1m":
+                    print_summary(f"{name} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(start))})", summary)
+
+    def watch_stdin(self, stop):
+        # 표준 입력을 이벤트 루프에서 감시 (스레드 없음), q 입력 시 stop 완료 -> 모든 작업 취소
+        loop = asyncio.get_running_loop()
+
+        def on_input():
+            line = sys.stdin.readline()
+            if not line:  # 입력이 끝나면(EOF) 감시만 멈춤
+                loop.remove_reader(sys.stdin.fileno())
+                return
+            key = line.strip()
+            if key.lower() == "q":
+                if not stop.done():
+                    stop.set_result(None)
+            elif key in self.rollups.names:
+                self.get_rollup(key)
+            elif key == "status":
+                print(f"센서 {len(self.latest)}개, 읽은 값 {self.readings}개")
+                self.get_sensor_timing()
+
+        try:
+            loop.add_reader(sys.stdin.fileno(), on_input)
+            return True
+        except (NotImplementedError, ValueError, OSError):  # 윈도우 등에서는 Ctrl+C로만 종료
+            return False
+
+    async def run_sensors(self, count=1000, cadences=(1, 5, 10), duration=None, queue_size=10000):
+        # 센서마다 작업 하나, 주기는 cadences를 돌아가며 배정, 종료는 플래그가 아니라 작업 취소로 처리
+        self.latest = {}
+        self.readings = 0
+        self.schedulers = {}  # 센서 번호 -> PeriodicScheduler
+        queue = asyncio.Queue(maxsize=queue_size)  # 집계가 밀리면 센서 작업이 기다리도록 크기 제한
+        sensors = [
+            asyncio.create_task(self.sensor_task(i, DummySensor(seed=i), cadences[i % len(cadences)], queue))
+            for i in range(count)
+        ]
+        aggregator = asyncio.create_task(self.aggregate(queue))
+        stop = asyncio.get_running_loop().create_future()
+        watching = self.watch_stdin(stop)
+        if duration is not None:
+            asyncio.get_running_loop().call_later(duration, lambda: stop.done() or stop.set_result(None))
+        try:
+            await stop
+        finally:
+            if watching:
+                asyncio.get_running_loop().remove_reader(sys.stdin.fileno())  # 이미 제거된 경우에도 안전
+            for task in sensors + [aggregator]:
+                task.cancel()
+            await asyncio.gather(*sensors, aggregator, return_exceptions=True)
+            print(f"System stopped... (센서 {count}개, 읽은 값 {self.readings}개)")
+
+    def get_sensor_timing(self):
+        # asyncio 모드: 모든 센서 스케줄러의 늦은 시간 통계를 합쳐서 출력
+        merged = StreamingStats(["lateness", "jitter"])
+        missed = 0
+        for scheduler in self.schedulers.values():
+            merged.merge_state(scheduler.stats.state)
+            missed += scheduler.missed
+        summary = merged.summary()
+        print("=== Sensor Timing ===")
+        print(dict_to_json_like_string({
+            "sensors": len(self.schedulers),
+            "missed_ticks": missed,
+            "lateness_mean_ms": summary["mean"]["lateness"] * 1000,
+            "lateness_max_ms": summary["max"]["lateness"] * 1000,
+            "jitter_stddev_ms": summary["stddev"]["jitter"] * 1000,
+        }))
+        print("=" * 30)
+
+    def get_rollup(self, name):
+        # 원하는 단위(1m/5m/1h/1d)의 지난 구간과 진행 중인 구간 통계를 출력
+        for start, summary in self.rollups.windows(name):
+            print_summary(f"{name} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(start))})", summary)
+
     def get_mission_computer_info(self): #운영체제 cpu 메모리 정보 
         info = {}
         try:
@@ -174,13 +586,27 @@ def listen_for_stop(mission_computer):
         if key.lower() == 'q':
             mission_computer.running = False
             print("System stopped...")
+        elif key in mission_computer.rollups.names:  # 1m, 5m, 1h, 1d 입력 시 해당 단위 통계 출력
+            mission_computer.get_rollup(key)
+        elif key == "timing":  # 주기 실행 지연 통계 출력
+            mission_computer.get_timing()
 
 
 if __name__ == "__main__":
     RunComputer = MissionComputer()
     RunComputer.get_mission_computer_info()
     RunComputer.get_mission_computer_load()
-    
+
+    # python mars.mission_computer.py --async 1000 : 센서 1000개를 asyncio 작업으로 동시에 읽음
+    if "--async" in sys.argv:
+        position = sys.argv.index("--async") + 1
+        count = int(sys.argv[position]) if position < len(sys.argv) else 1000
+        try:
+            asyncio.run(RunComputer.run_sensors(count))
+        except KeyboardInterrupt:  # asyncio.run이 남은 작업을 취소하고 빠져나옴
+            print("System stopped...")
+        sys.exit(0)
+
     stop_thread = threading.Thread(target=listen_for_stop, args=(RunComputer,))
     stop_thread.daemon = True
     stop_thread.start()